@@ -0,0 +1,281 @@
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from config import get_settings
+
+class AdmissionRejected(Exception):
+    """A request turned away before reaching its route (503 overloaded, 429 rate limited)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` requests of one route class run at once; up to
+    `max_queue` more wait in FIFO order for at most `queue_timeout` seconds.
+    Anything beyond that is rejected immediately, so admitted requests only
+    ever queue behind a bounded amount of work.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Exponential moving average of time spent holding a slot
+        self._service_seconds = 0.1
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_queued = 0
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is likely to have drained"""
+        drain = self._service_seconds * (len(self._waiters) + 1) / self.limit
+        return max(1, math.ceil(drain))
+
+    async def acquire(self):
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(503, f"Too many concurrent {self.name} requests", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queued = max(self.max_queued, len(self._waiters))
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise AdmissionRejected(503, f"Timed out waiting for a {self.name} slot", self.retry_after())
+        except asyncio.CancelledError:
+            # Cancelled after a slot was handed over: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        self.admitted += 1
+
+    def release(self, held_seconds: Optional[float] = None):
+        if held_seconds is not None:
+            self._service_seconds += 0.1 * (held_seconds - self._service_seconds)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self._active,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_service_ms": round(self._service_seconds * 1000, 1)
+        }
+
+class AdmissionTicket:
+    """A concurrency slot held by one request; released once, early or when the request ends"""
+
+    def __init__(self, limiter: ConcurrencyLimiter):
+        self.limiter = limiter
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self, early: bool = False):
+        if self.released:
+            return
+        self.released = True
+        # An early release says nothing about how long the work takes
+        self.limiter.release(None if early else time.monotonic() - self.started)
+
+def release_early(request: Request):
+    """
+    Give back a request's concurrency slot before it finishes, e.g. when it
+    only waits for a single-flight computation another request is running
+    """
+    ticket = getattr(request.state, "admission", None)
+    if ticket is not None:
+        ticket.release(early=True)
+
+class ClientRateLimiter:
+    """Token bucket per client: `rate` requests per second, bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.rejected = 0
+
+    def take(self, client: str) -> Optional[int]:
+        """Spend a token; None if allowed, else seconds until the next token"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if len(self._buckets) >= self.max_clients:
+            # Forget the least recently seen client (its bucket was likely full again)
+            self._buckets.popitem(last=False)
+        if tokens < 1:
+            self._buckets[client] = (tokens, now)
+            self.rejected += 1
+            return max(1, math.ceil((1 - tokens) / self.rate))
+        self._buckets[client] = (tokens - 1, now)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "rejected": self.rejected
+        }
+
+class AdmissionController:
+    """Classifies requests into route classes and admits them through that class's limiter"""
+
+    def __init__(
+        self,
+        routes: List[Tuple[str, str, str]],
+        limiters: Dict[str, ConcurrencyLimiter],
+        rate_limiter: Optional[ClientRateLimiter] = None,
+        client_header: Optional[str] = None
+    ):
+        # (method, path regex, route class); the first match wins
+        self._routes: List[Tuple[str, Pattern, str]] = [
+            (method, re.compile(pattern), route_class) for method, pattern, route_class in routes
+        ]
+        self.limiters = limiters
+        self.rate_limiter = rate_limiter
+        self.client_header = client_header.lower().encode("latin-1") if client_header else None
+
+    def client_key(self, scope) -> str:
+        """
+        Rate-limit key of a request: the `client_header` value if configured and
+        present, else the peer address. For comma-separated headers such as
+        X-Forwarded-For the last entry is used, the one the trusted proxy added.
+        """
+        if self.client_header is not None:
+            for name, value in scope.get("headers", ()):
+                if name == self.client_header:
+                    key = value.decode("latin-1").rpartition(",")[2].strip()
+                    if key:
+                        return key
+        return scope["client"][0] if scope.get("client") else "unknown"
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        for route_method, pattern, route_class in self._routes:
+            if route_method == method and pattern.fullmatch(path):
+                return route_class
+        return None
+
+    async def admit(self, route_class: str, client: str) -> AdmissionTicket:
+        """Admit a request or raise AdmissionRejected; release the returned ticket when done"""
+        if self.rate_limiter is not None:
+            retry_after = self.rate_limiter.take(client)
+            if retry_after is not None:
+                raise AdmissionRejected(429, "Rate limit exceeded", retry_after)
+        limiter = self.limiters[route_class]
+        await limiter.acquire()
+        return AdmissionTicket(limiter)
+
+    def stats(self) -> dict:
+        return {
+            "route_classes": {name: limiter.stats() for name, limiter in self.limiters.items()},
+            "clients": self.rate_limiter.stats() if self.rate_limiter else None
+        }
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying admission control before routing
+    Unclassified routes (health checks, metadata) are never limited. The
+    admitted request's ticket is in `request.state.admission`, so a route can
+    give its slot back early (see release_early).
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self._controller = controller
+
+    @property
+    def controller(self) -> AdmissionController:
+        # Resolved on first request so building the app never reads settings
+        if self._controller is None:
+            self._controller = get_admission_controller()
+        return self._controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        route_class = self.controller.classify(scope["method"], scope["path"])
+        if route_class is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            ticket = await self.controller.admit(route_class, self.controller.client_key(scope))
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            return await response(scope, receive, send)
+
+        scope.setdefault("state", {})["admission"] = ticket
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ticket.release()
+
+# Expensive routes by class; anything else passes straight through
+ADMISSION_ROUTES = [
+    ("POST", r"/api/matching/talent/[^/]+/jobs", "match"),
+    ("POST", r"/api/matching/job/[^/]+/talents", "match"),
+    ("GET", r"/api/matching/talent/[^/]+/job/[^/]+", "match"),
+    ("GET", r"/api/matching/(talent|job)/[^/]+/similar", "match"),
+    ("GET", r"/api/matching/(talents|jobs|stats)", "bulk"),
+    ("POST", r"/api/admin/create-(talent|job)", "bulk"),
+    ("GET", r"/api/admin/(profiles|check-data)", "bulk"),
+]
+
+_controller: Optional[AdmissionController] = None
+
+def get_admission_controller() -> AdmissionController:
+    """Controller configured from settings, built on first use"""
+    global _controller
+    if _controller is None:
+        settings = get_settings()
+        limiters = {
+            "match": ConcurrencyLimiter(
+                "match", settings.match_concurrency, settings.match_queue_depth, settings.admission_queue_timeout
+            ),
+            "bulk": ConcurrencyLimiter(
+                "bulk", settings.bulk_concurrency, settings.bulk_queue_depth, settings.admission_queue_timeout
+            ),
+        }
+        rate_limiter = None
+        if settings.client_rate_per_second > 0:
+            rate_limiter = ClientRateLimiter(settings.client_rate_per_second, settings.client_burst)
+        _controller = AdmissionController(ADMISSION_ROUTES, limiters, rate_limiter, settings.client_key_header)
+    return _controller
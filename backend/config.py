@@ -3,8 +3,49 @@ from functools import lru_cache
 from typing import Optional
 
 class Settings(BaseSettings):
-    supabase_url: str
-    supabase_key: str
+    supabase_url: Optional[str] = None
+    supabase_key: Optional[str] = None
+    # "supabase", "snapshot" (in-memory copy of Supabase, delta-synced) or
+    # "memory" (in-process rows, for local load testing)
+    data_backend: str = "supabase"
+    # Snapshot backend: delta sync interval, and interval between full reloads
+    # (which also catch skill edits that did not touch the parent's updated_at)
+    snapshot_sync_seconds: float = 30
+    snapshot_full_sync_seconds: float = 3600
+    # JSON file with {"talents": [...], "jobs": [...]}; synthetic data if unset
+    memory_data_file: Optional[str] = None
+    # JSON list of named scoring profiles; only the built-in default if unset
+    scoring_profiles_file: Optional[str] = None
+    # Offline gazetteer used to normalize locations; bundled data/gazetteer.json if unset
+    gazetteer_file: Optional[str] = None
+    # TF-IDF index built by `python text_similarity.py build`; plain TF if unset
+    text_index_file: Optional[str] = None
+    # Background match computation for newly created talents and jobs
+    match_queue_workers: int = 2
+    match_queue_size: int = 256
+    precomputed_matches: int = 100
+    # Seconds a precomputed list is served; bounds staleness from writes outside the API
+    precomputed_ttl_seconds: float = 60
+    # Precomputed pairs scoring below this are not stored (see score_store.py)
+    precomputed_min_score: float = 0
+    # Sharded matching: local worker processes (0 = score in-process), or
+    # "host:port,..." of shard servers started with `python sharding.py serve`
+    match_shards: int = 0
+    match_shard_addresses: Optional[str] = None
+    match_shard_authkey: Optional[str] = None
+    # Admission control: concurrent requests and wait-queue depth per route class
+    # ("match": scoring routes, "bulk": full listings and admin writes), and
+    # per-client token buckets (0 requests/second disables them)
+    match_concurrency: int = 4
+    match_queue_depth: int = 32
+    bulk_concurrency: int = 4
+    bulk_queue_depth: int = 16
+    admission_queue_timeout: float = 5.0
+    # Off by default: behind a gateway every request shares the gateway's address,
+    # so set CLIENT_KEY_HEADER (e.g. X-Forwarded-For, X-API-Key) before enabling
+    client_rate_per_second: float = 0
+    client_burst: int = 20
+    client_key_header: Optional[str] = None
     
     class Config:
         env_file = ".env"
@@ -13,6 +54,5 @@ class Settings(BaseSettings):
 
 @lru_cache()
 def get_settings():
+    """Build settings on first use so importing this module never reads env vars"""
     return Settings()
-
-settings = get_settings()
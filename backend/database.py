@@ -1,146 +1,686 @@
-from supabase import create_client, Client
-from config import settings
-from typing import List, Optional
-from models import TalentProfile, JobPosting, ExperienceLevel
-
-class Database:
-    _instance = None
-    _client = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(Database, cls).__new__(cls)
-        return cls._instance
-    
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from config import get_settings
+from pydantic import TypeAdapter
+from models import TalentProfile, JobPosting, ExperienceLevel, MatchFilters
+
+Row = Dict[str, Any]
+
+# Only the columns the matching engine reads; shared by every backend
+TALENT_COLUMNS = (
+    "id, profile_id, title, location, years_of_experience, experience_level, "
+    "remote_preference, hourly_rate_min, hourly_rate_max, bio, "
+    "profile:profiles(full_name), "
+    "talent_skills(skill:skills(name))"
+)
+
+JOB_COLUMNS = (
+    "id, title, description, location, experience_level, remote_allowed, salary_min, salary_max, "
+    "company_id, companies(name), "
+    "job_skills(skill:skills(name), is_required)"
+)
+
+# Snapshot syncs select the same columns plus the updated_at watermark
+SYNC_COLUMNS = {"talents": TALENT_COLUMNS, "jobs": JOB_COLUMNS}
+# PostgREST caps rows per response (1000 on Supabase by default), so syncs page
+SYNC_PAGE_SIZE = 1000
+
+# Columns each MatchFilters field maps to: (remote flag, range low, range high)
+TALENT_FILTER_COLUMNS = ("remote_preference", "hourly_rate_min", "hourly_rate_max")
+JOB_FILTER_COLUMNS = ("remote_allowed", "salary_min", "salary_max")
+
+_EXPERIENCE_LEVELS = {level.value for level in ExperienceLevel}
+
+# Whole pages are validated in one pass by a prebuilt adapter, which is
+# several times cheaper than constructing and validating models row by row
+_talents_adapter = TypeAdapter(List[TalentProfile])
+_jobs_adapter = TypeAdapter(List[JobPosting])
+
+# Rows validated per call when parsing a table
+PARSE_CHUNK = 1000
+
+@lru_cache()
+def get_supabase_client():
+    """Get Supabase client - created on first call and reused afterwards"""
+    # Imported lazily: supabase is the slowest import in the app
+    from supabase import create_client
+
+    settings = get_settings()
+    if not settings.supabase_url or not settings.supabase_key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env file")
+
+    return create_client(settings.supabase_url, settings.supabase_key)
+
+def _experience_level(value: Optional[str]) -> str:
+    return value if value in _EXPERIENCE_LEVELS else "mid"
+
+def _talent_fields(data: Row) -> Row:
+    """Map a talents row with its joined profile and skills to TalentProfile fields"""
+    return {
+        "id": str(data["id"]),
+        "full_name": data["profile"]["full_name"],
+        "title": data["title"],
+        "location": data.get("location") or "",
+        "skills": [ts["skill"]["name"] for ts in data.get("talent_skills") or []],
+        "years_of_experience": data.get("years_of_experience") or 0,
+        "experience_level": _experience_level(data.get("experience_level")),
+        "remote_preference": data.get("remote_preference") or False,
+        "hourly_rate_min": data.get("hourly_rate_min"),
+        "hourly_rate_max": data.get("hourly_rate_max"),
+        "bio": data.get("bio")
+    }
+
+def _job_fields(data: Row) -> Row:
+    """Map a jobs row with its joined company and skills to JobPosting fields"""
+    # Extract company name
+    company_name = "Unknown Company"
+    if data.get("companies"):
+        company_name = data["companies"].get("name", "Unknown Company")
+
+    # Split skills on job_skills.is_required (missing flag counts as required)
+    required_skills = []
+    preferred_skills = []
+    for js in data.get("job_skills") or []:
+        if js.get("is_required", True):
+            required_skills.append(js["skill"]["name"])
+        else:
+            preferred_skills.append(js["skill"]["name"])
+
+    return {
+        "id": str(data["id"]),
+        "title": data["title"],
+        "company": company_name,
+        "location": data.get("location") or "",
+        "required_skills": required_skills,
+        "preferred_skills": preferred_skills,
+        "min_years_experience": 0,  # Not in schema
+        "max_years_experience": None,
+        "experience_level": _experience_level(data.get("experience_level")),
+        "remote_allowed": data.get("remote_allowed") or False,
+        "salary_min": data.get("salary_min"),
+        "salary_max": data.get("salary_max"),
+        "description": data.get("description")
+    }
+
+def parse_talent(data: Row) -> TalentProfile:
+    return TalentProfile.model_validate(_talent_fields(data))
+
+def _parse_chunked(adapter: TypeAdapter, fields, rows: List[Row], deadline: Optional[float]) -> list:
+    # One validate_python call holds the GIL throughout; chunks let other threads
+    # (and the event loop) run, and let a load give up once `deadline` passes
+    parsed = []
+    for start in range(0, len(rows), PARSE_CHUNK):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError("Deadline passed while parsing rows")
+        parsed.extend(adapter.validate_python([fields(row) for row in rows[start:start + PARSE_CHUNK]]))
+    return parsed
+
+def parse_talents(rows: List[Row], deadline: Optional[float] = None) -> List[TalentProfile]:
+    return _parse_chunked(_talents_adapter, _talent_fields, rows, deadline)
+
+def parse_job(data: Row) -> JobPosting:
+    return JobPosting.model_validate(_job_fields(data))
+
+def parse_jobs(rows: List[Row], deadline: Optional[float] = None) -> List[JobPosting]:
+    return _parse_chunked(_jobs_adapter, _job_fields, rows, deadline)
+
+def apply_filters(query, filters: Optional[MatchFilters], columns: tuple):
+    """Push MatchFilters down into a PostgREST query"""
+    if filters is None:
+        return query
+    remote_column, low_column, high_column = columns
+    if filters.remote_only:
+        query = query.eq(remote_column, True)
+    if filters.experience_level:
+        query = query.eq("experience_level", filters.experience_level.value)
+    # Ranges overlap the band when low <= band max and high >= band min
+    if filters.salary_max is not None:
+        query = query.lte(low_column, filters.salary_max)
+    if filters.salary_min is not None:
+        query = query.gte(high_column, filters.salary_min)
+    if filters.location:
+        query = query.ilike("location", f"%{like_literal(filters.location.strip())}%")
+    return query
+
+def like_literal(text: str) -> str:
+    """Escape LIKE wildcards so `text` matches literally, as in row_matches"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def row_matches(row: Row, filters: Optional[MatchFilters], columns: tuple) -> bool:
+    """Evaluate MatchFilters against a row in memory, with the same semantics as apply_filters"""
+    if filters is None:
+        return True
+    remote_column, low_column, high_column = columns
+    if filters.remote_only and not row.get(remote_column):
+        return False
+    if filters.experience_level and row.get("experience_level") != filters.experience_level.value:
+        return False
+    if filters.salary_max is not None:
+        low = row.get(low_column)
+        if low is None or low > filters.salary_max:
+            return False
+    if filters.salary_min is not None:
+        high = row.get(high_column)
+        if high is None or high < filters.salary_min:
+            return False
+    if filters.location:
+        if filters.location.strip().lower() not in (row.get("location") or "").lower():
+            return False
+    return True
+
+def count_query(client, table: str, columns: str = "id"):
+    """
+    Select that returns no rows, only the exact count (add filters as usual)
+    A limit of 0 rather than head=True: postgrest-py parses the empty body of
+    a HEAD response as a count of 0.
+    """
+    return client.table(table).select(columns, count="exact").limit(0)
+
+class SupabaseBackend:
+    """Reads talent and job rows from Supabase"""
+
+    # The supabase client is synchronous, so calls are moved off the event loop
+    blocking = True
+
+    @property
+    def client(self):
+        return get_supabase_client()
+
+    def fetch_talents(
+        self,
+        talent_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        query = self.client.table("talents").select(TALENT_COLUMNS)
+        if talent_id is not None:
+            query = query.eq("id", talent_id)
+        query = apply_filters(query, filters, TALENT_FILTER_COLUMNS)
+        return query.execute().data or []
+
+    def fetch_jobs(
+        self,
+        job_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        query = self.client.table("jobs").select(JOB_COLUMNS)
+        if job_id is not None:
+            query = query.eq("id", job_id)
+        query = apply_filters(query, filters, JOB_FILTER_COLUMNS)
+        return query.execute().data or []
+
+    def _paged(self, build_query) -> List[Row]:
+        """Run a query page by page; `build_query` returns a fresh query each time"""
+        rows: List[Row] = []
+        while True:
+            page = build_query().range(len(rows), len(rows) + SYNC_PAGE_SIZE - 1).execute().data or []
+            rows.extend(page)
+            if len(page) < SYNC_PAGE_SIZE:
+                return rows
+
+    def fetch_changed(self, table: str, since: Optional[str]) -> List[Row]:
+        """Rows of `table` updated at or after `since` (every row if None), oldest first"""
+        def build_query():
+            query = self.client.table(table).select(f"{SYNC_COLUMNS[table]}, updated_at")
+            if since is not None:
+                query = query.gte("updated_at", since)
+            return query.order("updated_at").order("id")
+        return self._paged(build_query)
+
+    def fetch_ids(self, table: str, first: Optional[str] = None, last: Optional[str] = None) -> List[str]:
+        """IDs of `table`, optionally only those between `first` and `last` inclusive"""
+        def build_query():
+            return self._id_range(self.client.table(table).select("id"), first, last).order("id")
+        return [str(row["id"]) for row in self._paged(build_query)]
+
+    def count(self, table: str, first: Optional[str] = None, last: Optional[str] = None) -> int:
+        """Exact row count (optionally of an ID range), without transferring any rows"""
+        return self._id_range(count_query(self.client, table), first, last).execute().count or 0
+
+    @staticmethod
+    def _id_range(query, first: Optional[str], last: Optional[str]):
+        if first is not None:
+            query = query.gte("id", first)
+        if last is not None:
+            query = query.lte("id", last)
+        return query
+
+class MemoryBackend:
+    """
+    Serves talent and job rows from memory, shaped exactly like Supabase rows
+    Used for local development and load testing without any external service
+    """
+
+    blocking = False
+
+    def __init__(self, talents: Optional[List[Row]] = None, jobs: Optional[List[Row]] = None):
+        self.talents: Dict[str, Row] = {str(row["id"]): row for row in talents or []}
+        self.jobs: Dict[str, Row] = {str(row["id"]): row for row in jobs or []}
+
+    @classmethod
+    def from_file(cls, path: str) -> "MemoryBackend":
+        """Load rows from a JSON file of the form {"talents": [...], "jobs": [...]}"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("talents", []), data.get("jobs", []))
+
+    @classmethod
+    def synthetic(cls, talents: int = 1000, jobs: int = 200, seed: int = 0) -> "MemoryBackend":
+        """Generate a deterministic random dataset of the given size"""
+        rng = random.Random(seed)
+        skills = [
+            "Python", "JavaScript", "TypeScript", "React", "FastAPI", "Django",
+            "PostgreSQL", "Docker", "Kubernetes", "AWS", "Go", "Rust", "Java",
+            "Node.js", "GraphQL", "Redis", "Terraform", "Figma", "SQL", "Pandas"
+        ]
+        titles = [
+            "Backend Engineer", "Frontend Developer", "Full Stack Engineer",
+            "Data Engineer", "DevOps Engineer", "Product Designer", "ML Engineer"
+        ]
+        locations = ["New York, NY", "San Francisco, CA", "London", "Berlin", "Paris", "Remote"]
+        levels = ["entry", "mid", "senior", "lead"]
+        adjectives = ["Pragmatic", "Curious", "Experienced", "Product-minded", "Detail-oriented"]
+        topics = [
+            "distributed systems", "user interfaces", "data pipelines",
+            "cloud infrastructure", "machine learning", "design systems"
+        ]
+
+        talent_rows = []
+        for i in range(talents):
+            rate_min = rng.randrange(20, 120)
+            title = rng.choice(titles)
+            talent_rows.append({
+                "id": f"talent-{i}",
+                "profile_id": f"profile-{i}",
+                "title": title,
+                "bio": f"{rng.choice(adjectives)} {title.lower()} who enjoys {rng.choice(topics)}",
+                "location": rng.choice(locations),
+                "years_of_experience": rng.randrange(0, 20),
+                "experience_level": rng.choice(levels),
+                "remote_preference": rng.random() < 0.5,
+                "hourly_rate_min": rate_min,
+                "hourly_rate_max": rate_min + rng.randrange(0, 60),
+                "profile": {"full_name": f"Talent {i}"},
+                "talent_skills": [
+                    {"skill": {"name": name}} for name in rng.sample(skills, rng.randrange(2, 8))
+                ]
+            })
+
+        job_rows = []
+        for i in range(jobs):
+            salary_min = rng.randrange(20, 120)
+            title = rng.choice(titles)
+            job_rows.append({
+                "id": f"job-{i}",
+                "title": title,
+                "description": f"We are hiring a {rng.choice(adjectives)} {title.lower()} to work on {rng.choice(topics)}",
+                "location": rng.choice(locations),
+                "experience_level": rng.choice(levels),
+                "remote_allowed": rng.random() < 0.5,
+                "salary_min": salary_min,
+                "salary_max": salary_min + rng.randrange(0, 60),
+                "company_id": f"company-{i % 50}",
+                "companies": {"name": f"Company {i % 50}"},
+                "job_skills": [
+                    {"skill": {"name": name}, "is_required": rng.random() < 0.7}
+                    for name in rng.sample(skills, rng.randrange(2, 7))
+                ]
+            })
+
+        return cls(talent_rows, job_rows)
+
+    def fetch_talents(
+        self,
+        talent_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        return self._select(self.talents, talent_id, filters, TALENT_FILTER_COLUMNS)
+
+    def fetch_jobs(
+        self,
+        job_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        return self._select(self.jobs, job_id, filters, JOB_FILTER_COLUMNS)
+
+    def _table(self, table: str) -> Dict[str, Row]:
+        return {"talents": self.talents, "jobs": self.jobs}[table]
+
+    def fetch_changed(self, table: str, since: Optional[str]) -> List[Row]:
+        rows = self._table(table).values()
+        if since is not None:
+            rows = [row for row in rows if (row.get("updated_at") or "") >= since]
+        return sorted(rows, key=lambda row: row.get("updated_at") or "")
+
+    def fetch_ids(self, table: str, first: Optional[str] = None, last: Optional[str] = None) -> List[str]:
+        return sorted(
+            row_id for row_id in self._table(table)
+            if (first is None or row_id >= first) and (last is None or row_id <= last)
+        )
+
+    def count(self, table: str, first: Optional[str] = None, last: Optional[str] = None) -> int:
+        if first is None and last is None:
+            return len(self._table(table))
+        return len(self.fetch_ids(table, first, last))
+
+    @staticmethod
+    def _select(
+        rows: Dict[str, Row],
+        row_id: Optional[str],
+        filters: Optional[MatchFilters],
+        columns: tuple
+    ) -> List[Row]:
+        if row_id is not None:
+            row = rows.get(row_id)
+            return [row] if row else []
+        if filters is None or filters.is_empty():
+            return list(rows.values())
+        return [row for row in rows.values() if row_matches(row, filters, columns)]
+
+def _before(timestamp: Optional[str], seconds: float) -> Optional[str]:
+    """ISO timestamp `seconds` earlier"""
+    if timestamp is None:
+        return None
+    return (datetime.fromisoformat(timestamp) - timedelta(seconds=seconds)).isoformat()
+
+class SnapshotBackend(MemoryBackend):
+    """
+    In-memory snapshot of another backend (normally Supabase), kept fresh by delta syncs
+    Each sync asks only for rows whose updated_at is at or after the table's
+    watermark, less `overlap_seconds` for rows committed late, and upserts
+    them. Deletions are detected by comparing a count-only (limit=0) query with
+    the snapshot size; when they differ, ID ranges whose counts disagree are
+    bisected down to a page and only those pages of IDs are listed. Refresh
+    cost scales with churn, not table size. Changed tables are swapped in as
+    new dicts, so reads never see a half-applied sync. Rows are also kept
+    parsed (only changed rows are parsed again), so match requests never
+    re-validate the whole table.
+    """
+
+    def __init__(self, source, overlap_seconds: float = 5):
+        super().__init__()
+        self.source = source
+        self.overlap_seconds = overlap_seconds
+        self.watermarks: Dict[str, Optional[str]] = {"talents": None, "jobs": None}
+        self.synced_at: Optional[float] = None
+        self.last_sync: Dict[str, dict] = {}
+        # table -> id -> parsed TalentProfile / JobPosting
+        self.models: Dict[str, dict] = {"talents": {}, "jobs": {}}
+        self._sync_lock = threading.Lock()
+
     @property
-    def client(self) -> Client:
-        if self._client is None:
-            self._client = create_client(settings.supabase_url, settings.supabase_key)
-        return self._client
-    
+    def blocking(self) -> bool:
+        # Reads that would trigger the initial full load are moved off the event loop
+        return self.synced_at is None
+
+    def fetch_talents(
+        self,
+        talent_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        if self.synced_at is None:
+            self.sync()
+        return super().fetch_talents(talent_id, filters)
+
+    def fetch_jobs(
+        self,
+        job_id: Optional[str] = None,
+        filters: Optional[MatchFilters] = None
+    ) -> List[Row]:
+        if self.synced_at is None:
+            self.sync()
+        return super().fetch_jobs(job_id, filters)
+
+    def count(self, table: str, first: Optional[str] = None, last: Optional[str] = None) -> int:
+        if self.synced_at is None:
+            self.sync()
+        return super().count(table, first, last)
+
+    def fetch_models(self, table: str, filters: Optional[MatchFilters] = None) -> list:
+        """Parsed talents or jobs passing `filters`, without parsing anything again"""
+        rows = self.fetch_talents(None, filters) if table == "talents" else self.fetch_jobs(None, filters)
+        models = self.models[table]
+        parse = parse_talent if table == "talents" else parse_job
+        # A read racing a sync may see a row before its model is swapped in
+        return [models.get(str(row["id"])) or parse(row) for row in rows]
+
+    def sync(self, full: bool = False) -> Dict[str, dict]:
+        """Apply changes since the last sync (everything if `full`); returns per-table stats"""
+        with self._sync_lock:
+            if full:
+                self.watermarks = {"talents": None, "jobs": None}
+            stats = {table: self._sync_table(table) for table in ("talents", "jobs")}
+            self.synced_at = time.monotonic()
+            self.last_sync = stats
+            return stats
+
+    def _sync_table(self, table: str) -> dict:
+        rows = self._table(table)
+        full = self.watermarks[table] is None
+        changed = self.source.fetch_changed(table, _before(self.watermarks[table], self.overlap_seconds))
+
+        # The overlap re-reads recent rows; only copy the table if something differs
+        fresh = [row for row in changed if rows.get(str(row["id"])) != row]
+        updated = None
+        if full:
+            # A full sync returned every row: it replaces the table outright
+            updated = {str(row["id"]): row for row in changed}
+        elif fresh:
+            updated = dict(rows)
+            for row in fresh:
+                updated[str(row["id"])] = row
+        if changed:
+            stamps = [row["updated_at"] for row in changed if row.get("updated_at")]
+            if stamps:
+                self.watermarks[table] = max(stamps, key=datetime.fromisoformat)
+
+        deleted = 0
+        stale: List[str] = []
+        current = updated if updated is not None else rows
+        # Every insert has just been applied, so a lower server count means deletions
+        if not full and self.source.count(table) < len(current):
+            stale = self._find_deleted(table, sorted(current))
+            if stale:
+                if updated is None:
+                    updated = dict(rows)
+                for row_id in stale:
+                    del updated[row_id]
+                deleted = len(stale)
+
+        if updated is not None:
+            parse = parse_talents if table == "talents" else parse_jobs
+            if full:
+                models = dict(zip(updated, parse(list(updated.values()))))
+            else:
+                models = dict(self.models[table])
+                models.update(zip((str(row["id"]) for row in fresh), parse(fresh)))
+                for row_id in stale:
+                    models.pop(row_id, None)
+            # Models first, so rows are never visible without them
+            self.models[table] = models
+            setattr(self, table, updated)
+        return {"changed": len(fresh), "deleted": deleted, "rows": len(self._table(table))}
+
+    def _find_deleted(self, table: str, ids: List[str]) -> List[str]:
+        """
+        Snapshot IDs (sorted) that are gone from the source
+        Ranges whose server count matches are skipped; mismatched ranges are
+        halved until they fit in one page of IDs. Rows inserted since the
+        delta can hide a deletion in their range until the next sync, but
+        never cause a live row to be dropped.
+        """
+        stale: List[str] = []
+        ranges = [(0, len(ids))]
+        while ranges:
+            start, end = ranges.pop()
+            if start >= end:
+                continue
+            first, last = ids[start], ids[end - 1]
+            if end - start <= SYNC_PAGE_SIZE:
+                present = set(self.source.fetch_ids(table, first, last))
+                stale.extend(row_id for row_id in ids[start:end] if row_id not in present)
+            elif self.source.count(table, first, last) < end - start:
+                middle = (start + end) // 2
+                ranges += [(start, middle), (middle, end)]
+        return stale
+
+class Repository:
+    """Talent and job access on top of a swappable row backend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def _fetch(self, method, *args) -> List[Row]:
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
     async def get_talent_by_id(self, talent_id: str) -> Optional[TalentProfile]:
         """Get talent profile by ID"""
-        response = self.client.table("talents").select(
-            "id, profile_id, title, location, years_of_experience, experience_level, "
-            "remote_preference, hourly_rate_min, hourly_rate_max, "
-            "profile:profiles(full_name), "
-            "talent_skills(skill:skills(name))"
-        ).eq("id", talent_id).single().execute()
-        
-        if response.data:
-            data = response.data
-            skills = [ts["skill"]["name"] for ts in data.get("talent_skills", [])]
-            return TalentProfile(
-                id=data["id"],
-                full_name=data["profile"]["full_name"],
-                title=data["title"],
-                location=data.get("location", ""),
-                skills=skills,
-                years_of_experience=data["years_of_experience"],
-                experience_level=data["experience_level"],
-                remote_preference=data.get("remote_preference", False),
-                hourly_rate_min=data.get("hourly_rate_min"),
-                hourly_rate_max=data.get("hourly_rate_max")
-            )
-        return None
-    
-    async def get_all_talents(self) -> List[TalentProfile]:
-        """Get all talent profiles"""
-        response = self.client.table("talents").select(
-            "id, profile_id, title, location, years_of_experience, experience_level, "
-            "remote_preference, hourly_rate_min, hourly_rate_max, "
-            "profile:profiles(full_name), "
-            "talent_skills(skill:skills(name))"
-        ).execute()
-        
-        talents = []
-        for data in response.data:
-            skills = [ts["skill"]["name"] for ts in data.get("talent_skills", [])]
-            talents.append(TalentProfile(
-                id=data["id"],
-                full_name=data["profile"]["full_name"],
-                title=data["title"],
-                location=data.get("location", ""),
-                skills=skills,
-                years_of_experience=data["years_of_experience"],
-                experience_level=data["experience_level"],
-                remote_preference=data.get("remote_preference", False),
-                hourly_rate_min=data.get("hourly_rate_min"),
-                hourly_rate_max=data.get("hourly_rate_max")
-            ))
-        return talents
-    
+        try:
+            rows = await self._fetch(self.backend.fetch_talents, talent_id)
+            return parse_talent(rows[0]) if rows else None
+        except Exception as e:
+            print(f"Error fetching talent: {e}")
+            return None
+
+    def _load_all(self, table: str, filters: Optional[MatchFilters], deadline: Optional[float]) -> list:
+        """Parsed talents or jobs; the snapshot backend keeps them parsed already"""
+        if isinstance(self.backend, SnapshotBackend):
+            return self.backend.fetch_models(table, filters)
+        if table == "talents":
+            return parse_talents(self.backend.fetch_talents(None, filters), deadline)
+        return parse_jobs(self.backend.fetch_jobs(None, filters), deadline)
+
+    async def get_all_talents(
+        self,
+        filters: Optional[MatchFilters] = None,
+        deadline: Optional[float] = None
+    ) -> List[TalentProfile]:
+        """
+        Get all talent profiles (only those passing `filters`, if given), loaded off the event loop
+        With a `deadline` (time.monotonic()), parsing stops and TimeoutError is raised once it passes
+        """
+        try:
+            return await asyncio.to_thread(self._load_all, "talents", filters, deadline)
+        except TimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching talents: {e}")
+            return []
+
     async def get_job_by_id(self, job_id: str) -> Optional[JobPosting]:
         """Get job posting by ID"""
-        response = self.client.table("jobs").select(
-            "id, title, company, location, min_years_experience, max_years_experience, "
-            "experience_level, remote_allowed, salary_min, salary_max, "
-            "job_skills(skill:skills(name), demand_level)"
-        ).eq("id", job_id).single().execute()
-        
-        if response.data:
-            data = response.data
-            required_skills = [
-                js["skill"]["name"] for js in data.get("job_skills", [])
-                if js.get("demand_level") == "required"
-            ]
-            preferred_skills = [
-                js["skill"]["name"] for js in data.get("job_skills", [])
-                if js.get("demand_level") in ["preferred", "nice_to_have"]
-            ]
-            
-            return JobPosting(
-                id=data["id"],
-                title=data["title"],
-                company=data["company"],
-                location=data.get("location", ""),
-                required_skills=required_skills,
-                preferred_skills=preferred_skills,
-                min_years_experience=data.get("min_years_experience", 0),
-                max_years_experience=data.get("max_years_experience"),
-                experience_level=data.get("experience_level", "mid"),
-                remote_allowed=data.get("remote_allowed", False),
-                salary_min=data.get("salary_min"),
-                salary_max=data.get("salary_max")
-            )
-        return None
-    
-    async def get_all_jobs(self) -> List[JobPosting]:
-        """Get all job postings"""
-        response = self.client.table("jobs").select(
-            "id, title, company, location, min_years_experience, max_years_experience, "
-            "experience_level, remote_allowed, salary_min, salary_max, "
-            "job_skills(skill:skills(name), demand_level)"
-        ).execute()
-        
-        jobs = []
-        for data in response.data:
-            required_skills = [
-                js["skill"]["name"] for js in data.get("job_skills", [])
-                if js.get("demand_level") == "required"
-            ]
-            preferred_skills = [
-                js["skill"]["name"] for js in data.get("job_skills", [])
-                if js.get("demand_level") in ["preferred", "nice_to_have"]
-            ]
-            
-            jobs.append(JobPosting(
-                id=data["id"],
-                title=data["title"],
-                company=data["company"],
-                location=data.get("location", ""),
-                required_skills=required_skills,
-                preferred_skills=preferred_skills,
-                min_years_experience=data.get("min_years_experience", 0),
-                max_years_experience=data.get("max_years_experience"),
-                experience_level=data.get("experience_level", "mid"),
-                remote_allowed=data.get("remote_allowed", False),
-                salary_min=data.get("salary_min"),
-                salary_max=data.get("salary_max")
-            ))
-        return jobs
-
-def get_db():
-    return Database()
-
-db = get_db()
+        try:
+            rows = await self._fetch(self.backend.fetch_jobs, job_id)
+            return parse_job(rows[0]) if rows else None
+        except Exception as e:
+            print(f"Error fetching job: {e}")
+            return None
+
+    async def get_all_jobs(
+        self,
+        filters: Optional[MatchFilters] = None,
+        deadline: Optional[float] = None
+    ) -> List[JobPosting]:
+        """
+        Get all job postings (only those passing `filters`, if given), loaded off the event loop
+        With a `deadline` (time.monotonic()), parsing stops and TimeoutError is raised once it passes
+        """
+        try:
+            return await asyncio.to_thread(self._load_all, "jobs", filters, deadline)
+        except TimeoutError:
+            raise
+        except Exception as e:
+            print(f"Error fetching jobs: {e}")
+            return []
+
+    async def count(self, table: str) -> Optional[int]:
+        """Row count of "talents" or "jobs" without loading them (None if it fails)"""
+        try:
+            if self.backend.blocking:
+                return await asyncio.to_thread(self.backend.count, table)
+            return self.backend.count(table)
+        except Exception as e:
+            print(f"Error counting {table}: {e}")
+            return None
+
+_repository: Optional[Repository] = None
+
+def create_backend():
+    """Build the backend selected by the DATA_BACKEND setting"""
+    settings = get_settings()
+    if settings.data_backend == "memory":
+        if settings.memory_data_file:
+            return MemoryBackend.from_file(settings.memory_data_file)
+        return MemoryBackend.synthetic()
+    if settings.data_backend == "supabase":
+        return SupabaseBackend()
+    if settings.data_backend == "snapshot":
+        return SnapshotBackend(SupabaseBackend())
+    raise ValueError(
+        f"Unknown DATA_BACKEND '{settings.data_backend}' (expected 'supabase', 'snapshot' or 'memory')"
+    )
+
+def get_repository() -> Repository:
+    global _repository
+    if _repository is None:
+        _repository = Repository(create_backend())
+    return _repository
+
+def set_repository(repository: Optional[Repository]):
+    """Swap the active repository (None rebuilds it from settings on next use)"""
+    global _repository
+    _repository = repository
+
+async def get_talent_by_id(talent_id: str) -> Optional[TalentProfile]:
+    return await get_repository().get_talent_by_id(talent_id)
+
+async def get_all_talents(
+    filters: Optional[MatchFilters] = None,
+    deadline: Optional[float] = None
+) -> List[TalentProfile]:
+    return await get_repository().get_all_talents(filters, deadline)
+
+async def get_job_by_id(job_id: str) -> Optional[JobPosting]:
+    return await get_repository().get_job_by_id(job_id)
+
+async def get_all_jobs(
+    filters: Optional[MatchFilters] = None,
+    deadline: Optional[float] = None
+) -> List[JobPosting]:
+    return await get_repository().get_all_jobs(filters, deadline)
+
+async def count(table: str) -> Optional[int]:
+    return await get_repository().count(table)
+
+async def refresh_snapshot():
+    """Pick up recent writes now if the active backend is a snapshot (no-op otherwise)"""
+    backend = get_repository().backend
+    if isinstance(backend, SnapshotBackend):
+        await asyncio.to_thread(backend.sync)
+
+async def keep_snapshot_fresh():
+    """
+    Delta-sync the active snapshot backend every SNAPSHOT_SYNC_SECONDS, with a
+    full reload every SNAPSHOT_FULL_SYNC_SECONDS (returns at once for other backends)
+    """
+    settings = get_settings()
+    backend = get_repository().backend
+    if not isinstance(backend, SnapshotBackend):
+        return
+    last_full = time.monotonic()
+    while True:
+        await asyncio.sleep(settings.snapshot_sync_seconds)
+        full = time.monotonic() - last_full >= settings.snapshot_full_sync_seconds
+        try:
+            await asyncio.to_thread(backend.sync, full)
+            if full:
+                last_full = time.monotonic()
+        except Exception as e:
+            print(f"Snapshot sync failed: {e}")
@@ -0,0 +1,280 @@
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from config import get_settings
+
+# How two locations relate, best first. Scoring profiles map each relation
+# to a score, so location scoring is two integer lookups per pair.
+SAME = 0          # Same place ("NYC" vs "New York, NY")
+NEARBY = 1        # Different cities within NEARBY_KM
+WITHIN = 2        # One contains the other ("California" vs "San Jose"), or text overlap
+COMMUTE = 3       # Different cities within COMMUTE_KM
+SAME_REGION = 4
+SAME_COUNTRY = 5
+DIFFERENT = 6
+
+RELATION_COUNT = 7
+
+# Distance bands between cities for on-site roles
+NEARBY_KM = 50
+COMMUTE_KM = 150
+
+DEFAULT_GAZETTEER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.json")
+
+_PUNCTUATION = re.compile(r"[.()]")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(raw: str) -> str:
+    """Lowercase, strip accents and periods, and collapse whitespace"""
+    text = unicodedata.normalize("NFKD", raw or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _PUNCTUATION.sub("", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+def _distance_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Great-circle (haversine) distance between two (lat, lon) points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2 +
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371 * math.asin(math.sqrt(h))
+
+class LocationNormalizer:
+    """
+    Maps free-text locations to interned integer IDs using an offline gazetteer
+    of cities, regions and countries, and relates any two of them through a
+    relation table precomputed for every pair of gazetteer places.
+    Strings the gazetteer does not know get their own IDs and fall back to
+    exact/substring comparison of the normalized text.
+    """
+
+    def __init__(self, gazetteer: dict):
+        # Place data, indexed by place ID: (kind, region ID, country ID, coordinates)
+        self._kinds: List[str] = []
+        self._regions: List[Optional[int]] = []
+        self._countries: List[Optional[int]] = []
+        self._coords: List[Optional[Tuple[float, float]]] = []
+        self._names: List[str] = []
+        self._city_aliases: Dict[str, int] = {}
+        self._region_aliases: Dict[str, int] = {}
+        self._country_aliases: Dict[str, int] = {}
+
+        country_ids = {}
+        for country in gazetteer.get("countries", []):
+            place = self._add_place("country", None, None, None, country["name"])
+            self._countries[place] = place
+            country_ids[country["code"]] = place
+            self._add_aliases(self._country_aliases, place, country)
+
+        region_ids = {}
+        for region in gazetteer.get("regions", []):
+            country = country_ids[region["country"]]
+            place = self._add_place("region", None, country, None, region["name"])
+            self._regions[place] = place
+            region_ids[region["code"]] = place
+            self._add_aliases(self._region_aliases, place, region)
+
+        for city in gazetteer.get("cities", []):
+            region = region_ids.get(city.get("region"))
+            if region is not None:
+                country = self._countries[region]
+            else:
+                country = country_ids[city["country"]]
+            coords = (city["lat"], city["lon"]) if "lat" in city else None
+            place = self._add_place("city", region, country, coords, city["name"])
+            self._add_aliases(self._city_aliases, place, city)
+
+        self.place_count = len(self._kinds)
+        self._table = self._build_table()
+
+        # Interned IDs for raw strings; unknown strings get IDs >= place_count
+        self._ids: Dict[str, int] = {}
+        self._unknown_text: Dict[int, str] = {}
+        # Unknown IDs known to lie in a region/country ("Paris, TX" -> Texas)
+        self._areas: Dict[int, int] = {}
+        self._unknown_relations: Dict[Tuple[int, int], int] = {}
+        # Interning new strings is the only write path; background matching
+        # scores in worker threads, so it is serialized
+        self._intern_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocationNormalizer":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _add_place(self, kind, region, country, coords, name) -> int:
+        self._kinds.append(kind)
+        self._regions.append(region)
+        self._countries.append(country)
+        self._coords.append(coords)
+        self._names.append(normalize_text(name))
+        return len(self._kinds) - 1
+
+    @staticmethod
+    def _add_aliases(aliases: Dict[str, int], place: int, entry: dict):
+        for alias in [entry["name"], entry.get("code", "")] + entry.get("aliases", []):
+            text = normalize_text(alias)
+            if text:
+                aliases.setdefault(text, place)
+
+    def _contains(self, outer: int, inner: int) -> bool:
+        kind = self._kinds[outer]
+        if kind == "country":
+            return self._countries[inner] == outer
+        if kind == "region":
+            return self._regions[inner] == outer
+        return False
+
+    def _relate_places(self, a: int, b: int) -> int:
+        if a == b:
+            return SAME
+        if self._contains(a, b) or self._contains(b, a):
+            return WITHIN
+        if self._coords[a] and self._coords[b]:
+            distance = _distance_km(self._coords[a], self._coords[b])
+            if distance <= NEARBY_KM:
+                return NEARBY
+            if distance <= COMMUTE_KM:
+                return COMMUTE
+        if self._regions[a] is not None and self._regions[a] == self._regions[b]:
+            return SAME_REGION
+        if self._countries[a] == self._countries[b]:
+            return SAME_COUNTRY
+        return DIFFERENT
+
+    def _build_table(self) -> List[bytes]:
+        n = self.place_count
+        return [bytes(self._relate_places(a, b) for b in range(n)) for a in range(n)]
+
+    def _resolve(self, text: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (place, None) for a gazetteer place, e.g. "new york, ny"; (None, area)
+        for an unknown or mismatched city in a known region/country, e.g.
+        "paris, tx"; (None, None) otherwise
+        """
+        if text in self._city_aliases:
+            return self._city_aliases[text], None
+
+        parts = [part.strip() for part in text.split(",") if part.strip()]
+        if not parts:
+            return None, None
+        if len(parts) == 1:
+            return self._region_aliases.get(parts[0], self._country_aliases.get(parts[0])), None
+
+        # Qualifiers after the first part, narrowest first; a code can name both
+        # a region and a country ("ca": California, Canada), so keep both
+        qualifiers = []
+        for part in parts[1:]:
+            for aliases in (self._region_aliases, self._country_aliases):
+                place = aliases.get(part)
+                if place is not None and place not in qualifiers:
+                    qualifiers.append(place)
+        if not qualifiers:
+            return None, None
+
+        first = self._city_aliases.get(parts[0])
+        if first is None:
+            first = self._region_aliases.get(parts[0])
+        if first is not None and any(self._contains(qualifier, first) for qualifier in qualifiers):
+            return first, None
+        # Unknown or mismatched city ("Paris, TX"): somewhere in the qualifier
+        return None, qualifiers[0]
+
+    def normalize(self, raw: str) -> int:
+        """Interned location ID for a raw location string"""
+        location_id = self._ids.get(raw)
+        if location_id is not None:
+            return location_id
+        with self._intern_lock:
+            return self._intern(raw)
+
+    def _intern(self, raw: str) -> int:
+        location_id = self._ids.get(raw)
+        if location_id is None:
+            text = normalize_text(raw)
+            location_id, area = self._resolve(text)
+            if location_id is None:
+                location_id = self._ids.get(text)
+                if location_id is None:
+                    location_id = self.place_count + len(self._unknown_text)
+                    self._unknown_text[location_id] = text
+                    if area is not None:
+                        self._areas[location_id] = area
+                self._ids[text] = location_id
+            self._ids[raw] = location_id
+        return location_id
+
+    def relation_between(self, a: int, b: int) -> int:
+        """Relation (SAME..DIFFERENT) between two location IDs"""
+        n = self.place_count
+        if a < n and b < n:
+            return self._table[a][b]
+        if a == b:
+            return SAME
+        key = (a, b)
+        relation = self._unknown_relations.get(key)
+        if relation is None:
+            if a in self._areas or b in self._areas:
+                relation = self._relate_areas(a, b)
+            else:
+                text_a = self._text(a)
+                text_b = self._text(b)
+                relation = WITHIN if text_a in text_b or text_b in text_a else DIFFERENT
+            if len(self._unknown_relations) >= 100_000:
+                self._unknown_relations.clear()
+            self._unknown_relations[key] = relation
+        return relation
+
+    def _relate_areas(self, a: int, b: int) -> int:
+        """
+        Relation when at least one side is an unknown place in a known area
+        It is somewhere in that area, not the area itself: only a place that
+        encloses it is WITHIN; anything else in its area is SAME_REGION or
+        SAME_COUNTRY.
+        """
+        if a not in self._areas:
+            a, b = b, a
+        area = self._areas[a]
+        other = self._areas.get(b, b)
+        if other >= self.place_count:
+            # Unresolved text on the other side: nothing to relate it to
+            return DIFFERENT
+        if b not in self._areas and (other == area or self._contains(other, area)):
+            return WITHIN
+        if other == area or self._contains(area, other):
+            shared = area
+        elif self._contains(other, area):
+            # The other side is an unknown place in the wider area
+            shared = other
+        else:
+            return self._table[area][other]
+        return SAME_REGION if self._kinds[shared] == "region" else SAME_COUNTRY
+
+    def relation(self, raw_a: str, raw_b: str) -> int:
+        """Relation (SAME..DIFFERENT) between two raw location strings"""
+        # Hot path: both strings already interned and both in the gazetteer
+        a = self._ids.get(raw_a)
+        if a is None:
+            a = self.normalize(raw_a)
+        b = self._ids.get(raw_b)
+        if b is None:
+            b = self.normalize(raw_b)
+        if a < self.place_count and b < self.place_count:
+            return self._table[a][b]
+        return self.relation_between(a, b)
+
+    def _text(self, location_id: int) -> str:
+        if location_id < self.place_count:
+            return self._names[location_id]
+        return self._unknown_text[location_id]
+
+@lru_cache()
+def get_location_normalizer() -> LocationNormalizer:
+    """Normalizer for the GAZETTEER_FILE setting (bundled gazetteer by default), built on first use"""
+    return LocationNormalizer.from_file(get_settings().gazetteer_file or DEFAULT_GAZETTEER)
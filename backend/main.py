@@ -1,14 +1,70 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from admission import AdmissionMiddleware, get_admission_controller
 from routers import matching, admin
-from config import settings
+
+def _start_shards():
+    """Spawn or connect to match shards if configured; matching stays in-process until they are ready"""
+    import sharding
+    try:
+        sharding.start_shards()
+    except Exception as e:
+        print(f"Sharded matching disabled: {e}")
+
+def _warm_up():
+    """Build the data backend (and Supabase client) once, off the request path"""
+    import database as db
+    try:
+        repository = db.get_repository()
+        if isinstance(repository.backend, db.SupabaseBackend):
+            repository.backend.client
+        elif isinstance(repository.backend, db.SnapshotBackend):
+            # Initial full load; later syncs only fetch changed rows
+            repository.backend.sync()
+    except Exception as e:
+        print(f"Data backend not initialized at startup: {e}")
+
+async def _keep_snapshot_fresh(warm_up: asyncio.Task):
+    """Delta-sync the snapshot backend (if configured) once the initial load is done"""
+    import database as db
+    await asyncio.gather(warm_up, return_exceptions=True)
+    try:
+        await db.keep_snapshot_fresh()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Snapshot sync disabled: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers as soon as the app is up
+    warm_up = asyncio.create_task(asyncio.to_thread(_warm_up))
+    shards = asyncio.create_task(asyncio.to_thread(_start_shards))
+    match_queue = matching.get_match_queue()
+    match_queue.start()
+    snapshot_sync = asyncio.create_task(_keep_snapshot_fresh(warm_up))
+    yield
+    snapshot_sync.cancel()
+    await match_queue.stop()
+    if not warm_up.done():
+        warm_up.cancel()
+    await asyncio.gather(shards, return_exceptions=True)
+    import sharding
+    sharding.stop_shards()
 
 app = FastAPI(
     title="TalentBrains Matching API",
     description="Simple matching system for talents and jobs",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Admission control for expensive routes (innermost, so rejections still get CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -16,8 +72,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Partial-result flags set by time-budgeted match requests
+    expose_headers=["X-Match-Partial", "X-Match-Coverage"],
 )
 
+# Gzip responses over 1 KB for clients that send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(matching.router, prefix="/api/matching", tags=["matching"])
 app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
@@ -30,6 +91,11 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics/admission")
+def admission_metrics():
+    """Active and queued requests and rejections per route class, plus rate limiting"""
+    return get_admission_controller().stats()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,233 @@
+import hashlib
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from models import MatchResult
+from score_store import CompactScoreStore
+
+# Score components tracked by histograms, as (name, MatchResult field)
+HISTOGRAM_FIELDS = (
+    ("match", "match_score"),
+    ("skill", "skill_match_score"),
+    ("experience", "experience_match_score"),
+    ("location", "location_match_score"),
+    ("salary", "salary_match_score"),
+)
+
+class ScoreHistogram:
+    """Fixed-bin histogram of 0-100 scores with running mean and variance"""
+
+    def __init__(self, bins: int = 20):
+        self.bins = bins
+        self.counts = array("Q", bytes(8 * bins))
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+
+    def add(self, score: float, count: int = 1):
+        """Count `score` (a negative `count` takes back scores added before)"""
+        self.counts[min(int(score * self.bins / 100), self.bins - 1)] += count
+        self.count += count
+        self.total += score * count
+        self.total_squares += score * score * count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile: interpolated within the bin it falls in"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        width = 100 / self.bins
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                return round(width * (i + (rank - seen) / count), 2)
+            seen += count
+        return 100.0
+
+    def summary(self) -> dict:
+        mean = self.total / self.count if self.count else None
+        variance = self.total_squares / self.count - mean * mean if self.count else None
+        return {
+            "count": self.count,
+            "mean": round(mean, 2) if mean is not None else None,
+            "stddev": round(max(variance, 0) ** 0.5, 2) if variance is not None else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "bin_width": 100 / self.bins,
+            "bins": list(self.counts)
+        }
+
+class CountMinSketch:
+    """
+    Approximate counts of a stream of strings in `width` x `depth` counters
+    Estimates never undercount; they overcount by more than e*N/width
+    (N = total count) with probability at most e^-depth.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        if not 1 <= depth <= 16:
+            raise ValueError("depth must be between 1 and 16")
+        self.width = width
+        self.depth = depth
+        self.rows = [array("Q", bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _cells(self, item: str) -> Iterable[Tuple[array, int]]:
+        # One digest split into independent 32-bit hashes, one per row
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=4 * self.depth).digest()
+        for i, row in enumerate(self.rows):
+            yield row, int.from_bytes(digest[4 * i:4 * i + 4], "little") % self.width
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Count `item` and return its new estimate (a negative `count` takes back earlier counts)"""
+        self.total += count
+        estimate = None
+        for row, cell in self._cells(item):
+            row[cell] += count
+            estimate = row[cell] if estimate is None else min(estimate, row[cell])
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[cell] for row, cell in self._cells(item))
+
+class HeavyHitters:
+    """The `k` most frequent items of a stream, by count-min estimate"""
+
+    def __init__(self, k: int = 20, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self._top: Dict[str, int] = {}
+
+    def add(self, item: str, count: int = 1):
+        estimate = self.sketch.add(item, count)
+        if count < 0:
+            if item in self._top:
+                if estimate:
+                    self._top[item] = estimate
+                else:
+                    del self._top[item]
+            return
+        if item in self._top or len(self._top) < self.k:
+            self._top[item] = estimate
+            return
+        weakest = min(self._top, key=self._top.get)
+        if estimate > self._top[weakest]:
+            del self._top[weakest]
+            self._top[item] = estimate
+
+    def top(self) -> List[Tuple[str, int]]:
+        return heapq.nlargest(self.k, self._top.items(), key=lambda item: item[1])
+
+class MatchAnalytics:
+    """
+    Match-score aggregates updated as matches are computed, read in O(1)
+    Each computed match list updates fixed-size score histograms, a
+    count-min sketch of missing skills (with its top skills), per-job
+    averages and coverage counters. A talent or job counts once, with its
+    latest complete match list: recomputing it replaces what it added
+    before, and partial scans only count towards coverage. The last
+    `max_entities` lists are kept (compactly) so they can be taken back.
+    """
+
+    def __init__(self, bins: int = 20, top_skills: int = 20, max_entities: int = 100_000):
+        self.histograms = {name: ScoreHistogram(bins) for name, _ in HISTOGRAM_FIELDS}
+        self.missing_skills = HeavyHitters(top_skills)
+        self.max_entities = max_entities
+        # Recorded match lists, least recently recorded first
+        self._recorded = CompactScoreStore()
+        self._order: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        # job id -> (matches, sum of match scores) from the job's own match list
+        self._jobs: Dict[str, Tuple[int, float]] = {}
+        self._matched: Dict[str, Set[str]] = {"talent": set(), "job": set()}
+        self.scans = 0
+        self.partial_scans = 0
+        self.candidates_scored = 0
+        self.candidates_total = 0
+
+    def record(
+        self,
+        kind: str,
+        entity_id: str,
+        results: List[MatchResult],
+        scanned: Optional[int] = None,
+        total: Optional[int] = None,
+        partial: bool = False
+    ):
+        """Fold in the matches computed for a talent ("talent") or job ("job")"""
+        if scanned is not None:
+            self.scans += 1
+            self.candidates_scored += scanned
+            self.candidates_total += total
+            partial = partial or scanned < total
+        if partial:
+            self.partial_scans += 1
+            return
+        key = (kind, entity_id)
+        self._forget(key)
+        self._apply(kind, entity_id, results, 1)
+        self._recorded.put(kind, entity_id, results)
+        self._order[key] = None
+        if len(self._order) > self.max_entities:
+            self._forget(next(iter(self._order)))
+
+    def _forget(self, key: Tuple[str, str]):
+        """Take back what an entity's recorded match list added"""
+        if key not in self._order:
+            return
+        del self._order[key]
+        kind, entity_id = key
+        self._apply(kind, entity_id, self._recorded.get(kind, entity_id), -1)
+        self._recorded.discard(kind, entity_id)
+
+    def _apply(self, kind: str, entity_id: str, results: List[MatchResult], sign: int):
+        other = "job" if kind == "talent" else "talent"
+        for result in results:
+            for name, field in HISTOGRAM_FIELDS:
+                score = getattr(result, field)
+                if score is not None:
+                    self.histograms[name].add(score, sign)
+            for skill in result.missing_skills:
+                self.missing_skills.add(skill, sign)
+            if sign > 0:
+                self._matched[other].add(result.job_id if kind == "talent" else result.talent_id)
+        if sign > 0:
+            self._matched[kind].add(entity_id)
+            if kind == "job" and results:
+                self._jobs[entity_id] = (len(results), sum(result.match_score for result in results))
+        elif kind == "job":
+            self._jobs.pop(entity_id, None)
+
+    def job_average(self, job_id: str) -> Optional[dict]:
+        """Average match score over a job's latest match list, or None if it has none recorded"""
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+        count, total = entry
+        return {"job_id": job_id, "matches": count, "average_match_score": round(total / count, 2)}
+
+    def summary(self, total_talents: Optional[int] = None, total_jobs: Optional[int] = None) -> dict:
+        # Entities that took part in at least one computed match, on either side
+        talents, jobs = len(self._matched["talent"]), len(self._matched["job"])
+        return {
+            "score_histograms": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            "missing_skills": {
+                "total": self.missing_skills.sketch.total,
+                "top": [{"skill": skill, "count": count} for skill, count in self.missing_skills.top()]
+            },
+            "coverage": {
+                "talents_matched": talents,
+                "jobs_matched": jobs,
+                "talents_matched_share": round(talents / total_talents, 4) if total_talents else None,
+                "jobs_matched_share": round(jobs / total_jobs, 4) if total_jobs else None,
+                "jobs_with_averages": len(self._jobs),
+                "match_lists_recorded": len(self._order),
+                "scans": self.scans,
+                "partial_scans": self.partial_scans,
+                "candidates_scored_share": (
+                    round(self.candidates_scored / self.candidates_total, 4) if self.candidates_total else None
+                )
+            }
+        }
+
+match_analytics = MatchAnalytics()
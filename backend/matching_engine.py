@@ -1,9 +1,56 @@
-from typing import List, Tuple
+import heapq
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from models import TalentProfile, JobPosting, MatchResult, ExperienceLevel
+from scoring_profiles import CompiledProfile, DEFAULT_PROFILE
+from locations import LocationNormalizer, get_location_normalizer
+from text_similarity import TfidfIndex, get_text_index, talent_text, job_text
+
+class ScanResult(NamedTuple):
+    """Top matches from a scan that may have been cut short by a deadline"""
+    results: List[MatchResult]
+    scanned: int
+    total: int
+    # Set when the deadline passed before candidates were even loaded
+    cut_short: bool = False
+    
+    @property
+    def partial(self) -> bool:
+        return self.cut_short or self.scanned < self.total
+    
+    @property
+    def coverage(self) -> float:
+        if not self.total:
+            return 0.0 if self.cut_short else 1.0
+        return self.scanned / self.total
 
 class MatchingEngine:
     """Simple matching engine based on skills, experience, location, and salary"""
     
+    # Candidates scored between deadline checks
+    SCAN_CHUNK = 256
+    
+    def __init__(
+        self,
+        locations: Optional[LocationNormalizer] = None,
+        text_index: Optional[TfidfIndex] = None
+    ):
+        self._locations = locations
+        self._text_index = text_index
+    
+    @property
+    def locations(self) -> LocationNormalizer:
+        # Loaded on first use so importing the engine stays cheap
+        if self._locations is None:
+            self._locations = get_location_normalizer()
+        return self._locations
+    
+    @property
+    def text_index(self) -> TfidfIndex:
+        if self._text_index is None:
+            self._text_index = get_text_index()
+        return self._text_index
+    
     EXPERIENCE_LEVELS = {
         "entry": 1,
         "mid": 2,
@@ -15,29 +62,30 @@ class MatchingEngine:
         self, 
         talent_skills: List[str], 
         required_skills: List[str], 
-        preferred_skills: List[str]
+        preferred_skills: List[str],
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> Tuple[float, List[str], List[str]]:
         """Calculate skill match score (0-100)"""
         talent_skills_lower = [s.lower() for s in talent_skills]
         required_skills_lower = [s.lower() for s in required_skills]
         preferred_skills_lower = [s.lower() for s in preferred_skills]
         
-        # Match required skills (70% weight)
+        # Match required skills (70 points by default)
         matched_required = [s for s in required_skills if s.lower() in talent_skills_lower]
         missing_required = [s for s in required_skills if s.lower() not in talent_skills_lower]
         
         if required_skills:
-            required_score = (len(matched_required) / len(required_skills)) * 70
+            required_score = (len(matched_required) / len(required_skills)) * profile.required_points
         else:
-            required_score = 70  # No required skills means full score
+            required_score = profile.required_points  # No required skills means full score
         
-        # Match preferred skills (30% weight)
+        # Match preferred skills (the remaining 30 points by default)
         matched_preferred = [s for s in preferred_skills if s.lower() in talent_skills_lower]
         
         if preferred_skills:
-            preferred_score = (len(matched_preferred) / len(preferred_skills)) * 30
+            preferred_score = (len(matched_preferred) / len(preferred_skills)) * profile.preferred_points
         else:
-            preferred_score = 30  # No preferred skills means full score
+            preferred_score = profile.preferred_points  # No preferred skills means full score
         
         total_score = required_score + preferred_score
         matched_skills = matched_required + matched_preferred
@@ -50,33 +98,37 @@ class MatchingEngine:
         talent_level: ExperienceLevel,
         job_min_years: int,
         job_max_years: int,
-        job_level: ExperienceLevel
+        job_level: ExperienceLevel,
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> float:
         """Calculate experience match score (0-100)"""
-        # Level match (60% weight)
+        # Level match (60 points by default)
         talent_level_num = self.EXPERIENCE_LEVELS.get(talent_level, 2)
         job_level_num = self.EXPERIENCE_LEVELS.get(job_level, 2)
         level_diff = abs(talent_level_num - job_level_num)
         
         if level_diff == 0:
-            level_score = 60
+            level_score = profile.level_exact
         elif level_diff == 1:
-            level_score = 40
+            level_score = profile.level_one_off
         else:
-            level_score = 20
+            level_score = profile.level_far
         
-        # Years match (40% weight)
+        # Years match (40 points by default)
         if talent_years >= job_min_years:
             if job_max_years and talent_years > job_max_years:
                 # Overqualified
                 years_over = talent_years - job_max_years
-                years_score = max(20, 40 - (years_over * 5))
+                years_score = max(
+                    profile.overqualified_floor,
+                    profile.years_points - years_over * profile.overqualified_penalty_per_year
+                )
             else:
-                years_score = 40
+                years_score = profile.years_points
         else:
             # Underqualified
             years_under = job_min_years - talent_years
-            years_score = max(0, 40 - (years_under * 10))
+            years_score = max(0, profile.years_points - years_under * profile.underqualified_penalty_per_year)
         
         return level_score + years_score
     
@@ -85,42 +137,35 @@ class MatchingEngine:
         talent_location: str,
         talent_remote: bool,
         job_location: str,
-        job_remote: bool
+        job_remote: bool,
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> float:
         """Calculate location match score (0-100)"""
         # Remote work compatibility
         if job_remote and talent_remote:
-            return 100
+            return profile.both_remote
         
         if job_remote and not talent_remote:
-            return 80  # Job is remote but talent prefers on-site
+            return profile.remote_job_onsite_talent  # Job is remote but talent prefers on-site
         
         if not job_remote and talent_remote:
-            return 60  # Job is on-site but talent prefers remote
+            return profile.onsite_job_remote_talent  # Job is on-site but talent prefers remote
         
-        # Location match
-        talent_city = talent_location.lower().strip()
-        job_city = job_location.lower().strip()
-        
-        if talent_city == job_city:
-            return 100
-        
-        # Check if same city mentioned
-        if talent_city in job_city or job_city in talent_city:
-            return 80
-        
-        return 30  # Different locations, no remote
+        # Location match: normalized IDs looked up in the precomputed relation table
+        return profile.location_scores[self.locations.relation(talent_location, job_location)]
     
     def calculate_salary_match(
         self,
         talent_rate_min: float,
         talent_rate_max: float,
         job_salary_min: float,
-        job_salary_max: float
+        job_salary_max: float,
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> float:
         """Calculate salary match score (0-100)"""
+        neutral = profile.salary_neutral
         if not talent_rate_min or not job_salary_min:
-            return 50  # Neutral if no salary info
+            return neutral  # Neutral if no salary info
         
         # Check overlap
         if talent_rate_min <= job_salary_max and talent_rate_max >= job_salary_min:
@@ -132,171 +177,293 @@ class MatchingEngine:
             talent_range = talent_rate_max - talent_rate_min
             if talent_range > 0:
                 overlap_pct = (overlap / talent_range) * 100
-                return min(100, 50 + overlap_pct / 2)
+                return min(100, neutral + overlap_pct * (100 - neutral) / 100)
             return 100
         
         # No overlap
         if talent_rate_min > job_salary_max:
             # Talent expects more
             diff_pct = ((talent_rate_min - job_salary_max) / job_salary_max) * 100
-            return max(0, 50 - diff_pct)
+            return max(0, neutral - diff_pct)
         else:
             # Job offers more
-            return 70
+            return profile.salary_job_offers_more
+    
+    def calculate_text_matches(self, query_text: str, kind: str, candidates: list, text_of) -> List[float]:
+        """Title/bio TF-IDF similarity (0-100) of one text against a batch of candidates"""
+        index = self.text_index
+        similarities = index.similarities(
+            index.vectorize(query_text),
+            kind,
+            [c.id for c in candidates],
+            (text_of(c) for c in candidates)
+        )
+        return [s * 100 for s in similarities]
+    
+    def text_scorer(self, query_text: str, kind: str, text_of) -> Callable[[object], float]:
+        """Per-candidate form of calculate_text_matches, for scans that may stop early"""
+        index = self.text_index
+        similarity = index.scorer(index.vectorize(query_text), kind)
+        return lambda candidate: similarity(candidate.id, text_of(candidate)) * 100
+    
+    def _score_pair(
+        self,
+        talent: TalentProfile,
+        job: JobPosting,
+        profile: CompiledProfile,
+        text_score: Optional[float] = None
+    ) -> tuple:
+        """Score one talent/job pair without building a MatchResult"""
+        # Calculate individual scores
+        skill_score, matched_skills, missing_skills = self.calculate_skill_match(
+            talent.skills,
+            job.required_skills,
+            job.preferred_skills or [],
+            profile
+        )
+        
+        experience_score = self.calculate_experience_match(
+            talent.years_of_experience,
+            talent.experience_level,
+            job.min_years_experience,
+            job.max_years_experience or 100,
+            job.experience_level,
+            profile
+        )
+        
+        location_score = self.calculate_location_match(
+            talent.location,
+            talent.remote_preference,
+            job.location,
+            job.remote_allowed,
+            profile
+        )
+        
+        salary_score = None
+        if talent.hourly_rate_min and job.salary_min:
+            salary_score = self.calculate_salary_match(
+                talent.hourly_rate_min,
+                talent.hourly_rate_max or talent.hourly_rate_min * profile.missing_max_spread,
+                job.salary_min,
+                job.salary_max or job.salary_min * profile.missing_max_spread,
+                profile
+            )
+        
+        # Calculate overall match score (weighted average)
+        overall_score = (
+            skill_score * profile.w_skills +
+            experience_score * profile.w_experience +
+            location_score * profile.w_location +
+            (salary_score or profile.salary_neutral) * profile.w_salary
+        )
+        if text_score is not None:
+            overall_score += text_score * profile.w_text
+        
+        return (
+            round(overall_score, 2), skill_score, experience_score,
+            location_score, salary_score, matched_skills, missing_skills, text_score
+        )
+    
+    def _build_result(self, scored: tuple, talent_id: str = None, job_id: str = None) -> MatchResult:
+        """Build the MatchResult for a scored pair that made the cut"""
+        (overall_score, skill_score, experience_score, location_score,
+         salary_score, matched_skills, missing_skills, text_score) = scored
+        
+        # Generate reason
+        reason = self._generate_match_reason(
+            skill_score, experience_score, location_score,
+            matched_skills, missing_skills
+        )
+        
+        return MatchResult(
+            talent_id=talent_id,
+            job_id=job_id,
+            match_score=overall_score,
+            skill_match_score=round(skill_score, 2),
+            experience_match_score=round(experience_score, 2),
+            location_match_score=round(location_score, 2),
+            salary_match_score=round(salary_score, 2) if salary_score else None,
+            text_match_score=round(text_score, 2) if text_score is not None else None,
+            matched_skills=matched_skills,
+            missing_skills=missing_skills,
+            reason=reason
+        )
+    
+    @staticmethod
+    def _top(scored: List[tuple], limit: Optional[int]) -> List[tuple]:
+        """Best `limit` (score, id, ...) entries by match score, in stable order"""
+        if limit is None:
+            return sorted(scored, key=lambda x: x[0][0], reverse=True)
+        return heapq.nlargest(limit, scored, key=lambda x: x[0][0])
     
     def match_talent_to_jobs(
         self,
         talent: TalentProfile,
-        jobs: List[JobPosting]
+        jobs: List[JobPosting],
+        limit: Optional[int] = None,
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> List[MatchResult]:
-        """Match a talent to multiple jobs"""
-        results = []
-        
-        for job in jobs:
-            # Calculate individual scores
-            skill_score, matched_skills, missing_skills = self.calculate_skill_match(
-                talent.skills,
-                job.required_skills,
-                job.preferred_skills
-            )
-            
-            experience_score = self.calculate_experience_match(
-                talent.years_of_experience,
-                talent.experience_level,
-                job.min_years_experience,
-                job.max_years_experience or 100,
-                job.experience_level
-            )
-            
-            location_score = self.calculate_location_match(
-                talent.location,
-                talent.remote_preference,
-                job.location,
-                job.remote_allowed
-            )
-            
-            salary_score = None
-            if talent.hourly_rate_min and job.salary_min:
-                salary_score = self.calculate_salary_match(
-                    talent.hourly_rate_min,
-                    talent.hourly_rate_max or talent.hourly_rate_min * 1.5,
-                    job.salary_min,
-                    job.salary_max or job.salary_min * 1.5
-                )
-            
-            # Calculate overall match score (weighted average)
-            weights = {
-                "skills": 0.40,
-                "experience": 0.30,
-                "location": 0.20,
-                "salary": 0.10
-            }
-            
-            overall_score = (
-                skill_score * weights["skills"] +
-                experience_score * weights["experience"] +
-                location_score * weights["location"] +
-                (salary_score or 50) * weights["salary"]
-            )
-            
-            # Generate reason
-            reason = self._generate_match_reason(
-                skill_score, experience_score, location_score, 
-                matched_skills, missing_skills
-            )
-            
-            results.append(MatchResult(
-                job_id=job.id,
-                match_score=round(overall_score, 2),
-                skill_match_score=round(skill_score, 2),
-                experience_match_score=round(experience_score, 2),
-                location_match_score=round(location_score, 2),
-                salary_match_score=round(salary_score, 2) if salary_score else None,
-                matched_skills=matched_skills,
-                missing_skills=missing_skills,
-                reason=reason
-            ))
-        
-        # Sort by match score
-        results.sort(key=lambda x: x.match_score, reverse=True)
-        return results
+        """Match a talent to multiple jobs, best first (top `limit` if given)"""
+        if profile.w_text:
+            text_scores = self.calculate_text_matches(talent_text(talent), "jobs", jobs, job_text)
+            scored = [
+                (self._score_pair(talent, job, profile, text_score), job.id)
+                for job, text_score in zip(jobs, text_scores)
+            ]
+        else:
+            scored = [(self._score_pair(talent, job, profile), job.id) for job in jobs]
+        return [
+            self._build_result(pair, job_id=job_id)
+            for pair, job_id in self._top(scored, limit)
+        ]
     
     def match_job_to_talents(
         self,
         job: JobPosting,
-        talents: List[TalentProfile]
+        talents: List[TalentProfile],
+        limit: Optional[int] = None,
+        profile: CompiledProfile = DEFAULT_PROFILE
     ) -> List[MatchResult]:
-        """Match a job to multiple talents"""
-        results = []
-        
-        for talent in talents:
-            # Calculate individual scores
-            skill_score, matched_skills, missing_skills = self.calculate_skill_match(
-                talent.skills,
-                job.required_skills,
-                job.preferred_skills
-            )
-            
-            experience_score = self.calculate_experience_match(
-                talent.years_of_experience,
-                talent.experience_level,
-                job.min_years_experience,
-                job.max_years_experience or 100,
-                job.experience_level
-            )
-            
-            location_score = self.calculate_location_match(
-                talent.location,
-                talent.remote_preference,
-                job.location,
-                job.remote_allowed
-            )
-            
-            salary_score = None
-            if talent.hourly_rate_min and job.salary_min:
-                salary_score = self.calculate_salary_match(
-                    talent.hourly_rate_min,
-                    talent.hourly_rate_max or talent.hourly_rate_min * 1.5,
-                    job.salary_min,
-                    job.salary_max or job.salary_min * 1.5
-                )
-            
-            # Calculate overall match score
-            weights = {
-                "skills": 0.40,
-                "experience": 0.30,
-                "location": 0.20,
-                "salary": 0.10
-            }
-            
-            overall_score = (
-                skill_score * weights["skills"] +
-                experience_score * weights["experience"] +
-                location_score * weights["location"] +
-                (salary_score or 50) * weights["salary"]
-            )
-            
-            # Generate reason
-            reason = self._generate_match_reason(
-                skill_score, experience_score, location_score,
-                matched_skills, missing_skills
-            )
-            
-            results.append(MatchResult(
-                talent_id=talent.id,
-                match_score=round(overall_score, 2),
-                skill_match_score=round(skill_score, 2),
-                experience_match_score=round(experience_score, 2),
-                location_match_score=round(location_score, 2),
-                salary_match_score=round(salary_score, 2) if salary_score else None,
-                matched_skills=matched_skills,
-                missing_skills=missing_skills,
-                reason=reason
-            ))
-        
-        # Sort by match score
-        results.sort(key=lambda x: x.match_score, reverse=True)
-        return results
+        """Match a job to multiple talents, best first (top `limit` if given)"""
+        if profile.w_text:
+            text_scores = self.calculate_text_matches(job_text(job), "talents", talents, talent_text)
+            scored = [
+                (self._score_pair(talent, job, profile, text_score), talent.id)
+                for talent, text_score in zip(talents, text_scores)
+            ]
+        else:
+            scored = [(self._score_pair(talent, job, profile), talent.id) for talent in talents]
+        return [
+            self._build_result(pair, talent_id=talent_id)
+            for pair, talent_id in self._top(scored, limit)
+        ]
+    
+    @staticmethod
+    def _skill_overlap(talent_skills: List[str], required: set, preferred: set) -> int:
+        """Scan priority of a pair: shared required skills count double, preferred once"""
+        overlap = 0
+        for skill in talent_skills:
+            skill = skill.lower()
+            if skill in required:
+                overlap += 2
+            elif skill in preferred:
+                overlap += 1
+        return overlap
+    
+    @staticmethod
+    def _job_skill_sets(job: JobPosting) -> Tuple[set, set]:
+        return {s.lower() for s in job.required_skills}, {s.lower() for s in job.preferred_skills or []}
+    
+    @staticmethod
+    def _priority_order(priorities: List[int]) -> List[int]:
+        """Candidate positions by descending priority, keeping candidate order within a priority"""
+        buckets: Dict[int, List[int]] = {}
+        for position, priority in enumerate(priorities):
+            buckets.setdefault(priority, []).append(position)
+        return [position for priority in sorted(buckets, reverse=True) for position in buckets[priority]]
+    
+    def _order_until(self, priority: Callable[[int], int], count: int, deadline: float) -> List[int]:
+        """
+        Positions of `count` candidates by descending priority, spending at most
+        half the time left before `deadline`; candidates not reached are left out
+        """
+        now = time.monotonic()
+        cutoff = now + (deadline - now) / 2
+        priorities = []
+        for start in range(0, count, self.SCAN_CHUNK):
+            if time.monotonic() >= cutoff:
+                break
+            priorities.extend(priority(position) for position in range(start, min(start + self.SCAN_CHUNK, count)))
+        return self._priority_order(priorities)
+    
+    def _scan_until(
+        self,
+        score: Callable[[int], tuple],
+        order: List[int],
+        limit: Optional[int],
+        deadline: float
+    ) -> Tuple[List[tuple], int]:
+        """
+        Score candidates in `order` until `deadline` (time.monotonic()); return
+        the top (scored, position) pairs and how many candidates were scored
+        """
+        scored = []
+        for start in range(0, len(order), self.SCAN_CHUNK):
+            if time.monotonic() >= deadline:
+                break
+            scored.extend((score(position), position) for position in order[start:start + self.SCAN_CHUNK])
+        # Equal scores keep candidate order, exactly as in a full scan
+        key = lambda x: (x[0][0], -x[1])
+        if limit is None:
+            return sorted(scored, key=key, reverse=True), len(scored)
+        return heapq.nlargest(limit, scored, key=key), len(scored)
+    
+    def scan_talent_to_jobs(
+        self,
+        talent: TalentProfile,
+        jobs: List[JobPosting],
+        limit: Optional[int] = None,
+        profile: CompiledProfile = DEFAULT_PROFILE,
+        deadline: Optional[float] = None
+    ) -> ScanResult:
+        """
+        Like match_talent_to_jobs, but stops scoring at `deadline` (time.monotonic())
+        Jobs sharing the most skills with the talent are scored first, so a
+        cut-short scan returns the best matches found among the likeliest ones.
+        """
+        if deadline is None:
+            return ScanResult(self.match_talent_to_jobs(talent, jobs, limit, profile), len(jobs), len(jobs))
+        
+        if time.monotonic() >= deadline:
+            return ScanResult([], 0, len(jobs))
+        
+        text_score_of = self.text_scorer(talent_text(talent), "jobs", job_text) if profile.w_text else None
+        order = self._order_until(
+            lambda position: self._skill_overlap(talent.skills, *self._job_skill_sets(jobs[position])),
+            len(jobs), deadline
+        )
+        
+        def score(position):
+            text_score = text_score_of(jobs[position]) if text_score_of else None
+            return self._score_pair(talent, jobs[position], profile, text_score)
+        
+        top, scanned = self._scan_until(score, order, limit, deadline)
+        results = [self._build_result(pair, job_id=jobs[position].id) for pair, position in top]
+        return ScanResult(results, scanned, len(jobs))
+    
+    def scan_job_to_talents(
+        self,
+        job: JobPosting,
+        talents: List[TalentProfile],
+        limit: Optional[int] = None,
+        profile: CompiledProfile = DEFAULT_PROFILE,
+        deadline: Optional[float] = None
+    ) -> ScanResult:
+        """
+        Like match_job_to_talents, but stops scoring at `deadline` (time.monotonic())
+        Talents with the most of the job's skills are scored first, so a
+        cut-short scan returns the best matches found among the likeliest ones.
+        """
+        if deadline is None:
+            return ScanResult(self.match_job_to_talents(job, talents, limit, profile), len(talents), len(talents))
+        
+        if time.monotonic() >= deadline:
+            return ScanResult([], 0, len(talents))
+        
+        text_score_of = self.text_scorer(job_text(job), "talents", talent_text) if profile.w_text else None
+        required, preferred = self._job_skill_sets(job)
+        order = self._order_until(
+            lambda position: self._skill_overlap(talents[position].skills, required, preferred),
+            len(talents), deadline
+        )
+        
+        def score(position):
+            text_score = text_score_of(talents[position]) if text_score_of else None
+            return self._score_pair(talents[position], job, profile, text_score)
+        
+        top, scanned = self._scan_until(score, order, limit, deadline)
+        results = [self._build_result(pair, talent_id=talents[position].id) for pair, position in top]
+        return ScanResult(results, scanned, len(talents))
     
     def _generate_match_reason(
         self,
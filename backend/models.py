@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
+from datetime import datetime
 from enum import Enum
 
 class ExperienceLevel(str, Enum):
@@ -24,6 +25,7 @@ class TalentProfile(BaseModel):
     remote_preference: bool = False
     hourly_rate_min: Optional[float] = None
     hourly_rate_max: Optional[float] = None
+    bio: Optional[str] = None
 
 class JobPosting(BaseModel):
     id: str
@@ -38,6 +40,7 @@ class JobPosting(BaseModel):
     remote_allowed: bool = False
     salary_min: Optional[float] = None
     salary_max: Optional[float] = None
+    description: Optional[str] = None
 
 class MatchResult(BaseModel):
     talent_id: Optional[str] = None
@@ -47,10 +50,61 @@ class MatchResult(BaseModel):
     experience_match_score: float
     location_match_score: float
     salary_match_score: Optional[float] = None
+    # Title/bio text similarity; only set when the scoring profile weighs it
+    text_match_score: Optional[float] = None
     matched_skills: List[str]
     missing_skills: List[str]
     reason: str
 
+class SimilarityResult(BaseModel):
+    talent_id: Optional[str] = None
+    job_id: Optional[str] = None
+    similarity: float = Field(..., ge=0, le=1)  # Jaccard similarity of skill sets
+    shared_skills: List[str]
+
+class MatchFilters(BaseModel):
+    """Candidate filters applied in the data layer, before anything is scored"""
+    remote_only: bool = False
+    experience_level: Optional[ExperienceLevel] = None
+    # Salary band; candidates whose range does not overlap it are excluded
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    # Case-insensitive substring of the candidate location
+    location: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return self == MatchFilters()
+
+    def cache_key(self) -> tuple:
+        return (
+            self.remote_only,
+            self.experience_level,
+            self.salary_min,
+            self.salary_max,
+            self.location.lower().strip() if self.location else None
+        )
+
+class MatchJobState(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+class MatchJobStatus(BaseModel):
+    """A background match computation for a newly created talent or job"""
+    id: str
+    kind: str  # "talent" or "job"
+    entity_id: str
+    state: MatchJobState = MatchJobState.queued
+    attempts: int = 0
+    error: Optional[str] = None
+    result_count: Optional[int] = None
+    submitted_at: datetime
+    finished_at: Optional[datetime] = None
+
+# Built once: serializes match results straight to JSON bytes
+match_results_adapter = TypeAdapter(List[MatchResult])
+
 class MatchRequest(BaseModel):
     talent_id: Optional[str] = None
     job_id: Optional[str] = None
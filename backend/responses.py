@@ -0,0 +1,21 @@
+from typing import Any, Dict, List, Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic_core import to_json
+from models import MatchResult, match_results_adapter
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust serializer
+    Returning it from a route skips FastAPI's jsonable_encoder pass entirely
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+def match_results_response(results: List[MatchResult], headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serialize match results with the precompiled List[MatchResult] adapter"""
+    return Response(
+        content=match_results_adapter.dump_json(results),
+        media_type="application/json",
+        headers=headers
+    )
@@ -1,7 +1,13 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
-import database_simple as db
+import database as db
+from models import MatchJobStatus
+from routers.matching import get_match_queue
+from sharding import reload_shard
+from similarity import skill_similarity
+from work_queue import QueueFullError
 
 router = APIRouter()
 
@@ -17,6 +23,41 @@ class CreateTalentRequest(BaseModel):
     hourly_rate_max: Optional[int] = None
     skills: List[str] = []  # Skill names
 
+class CreateJobRequest(BaseModel):
+    company_id: str  # Must be an existing company ID
+    title: str
+    description: str = ""
+    location: Optional[str] = None
+    remote_allowed: bool = False
+    experience_level: str = "mid"  # entry, mid, senior, lead
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    required_skills: List[str] = []  # Skill names
+    preferred_skills: List[str] = []
+
+def _get_or_create_skill(client, skill_name: str) -> str:
+    """ID of the skill with this name, creating it if it doesn't exist"""
+    skill_response = client.table("skills").select("id").eq("name", skill_name).execute()
+    if skill_response.data:
+        return skill_response.data[0]["id"]
+    new_skill = client.table("skills").insert({
+        "name": skill_name,
+        "category": "General"
+    }).execute()
+    return new_skill.data[0]["id"]
+
+def _queue_matches(kind: str, entity_id: str) -> Optional[MatchJobStatus]:
+    """Precompute matches for a new entity in the background; None if the queue is full"""
+    queue = get_match_queue()
+    # Stored lists of the other kind may now be missing the new entity
+    queue.store.invalidate("job" if kind == "talent" else "talent")
+    try:
+        return queue.submit(kind, entity_id)
+    except QueueFullError as e:
+        # Backpressure: matches will be computed on first request instead
+        print(f"Not precomputing matches for {kind} {entity_id}: {e}")
+        return None
+
 @router.post("/create-talent")
 async def create_talent(request: CreateTalentRequest):
     """
@@ -50,17 +91,7 @@ async def create_talent(request: CreateTalentRequest):
         if request.skills:
             for skill_name in request.skills:
                 # Find or create skill
-                skill_response = client.table("skills").select("id").eq("name", skill_name).execute()
-                
-                if skill_response.data:
-                    skill_id = skill_response.data[0]["id"]
-                else:
-                    # Create skill if it doesn't exist
-                    new_skill = client.table("skills").insert({
-                        "name": skill_name,
-                        "category": "General"
-                    }).execute()
-                    skill_id = new_skill.data[0]["id"]
+                skill_id = _get_or_create_skill(client, skill_name)
                 
                 # Link skill to talent
                 client.table("talent_skills").insert({
@@ -69,15 +100,108 @@ async def create_talent(request: CreateTalentRequest):
                     "proficiency_level": 3
                 }).execute()
         
+        # Make the new talent visible to similar-talent queries right away
+        skill_similarity.talents.upsert(str(talent_id), request.skills)
+        
+        # Pull the new row (and its skills) into the snapshot, if serving from one
+        await db.refresh_snapshot()
+        
+        # And onto the shard that owns it, if matching is sharded
+        await reload_shard(str(talent_id))
+        
+        # Compute its matches now so the first read is served from the store
+        match_job = _queue_matches("talent", str(talent_id))
+        
         return {
             "success": True,
             "talent_id": talent_id,
+            "match_job": match_job,
             "message": "Talent profile created successfully"
         }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating talent: {str(e)}")
 
+@router.post("/create-job")
+async def create_job(request: CreateJobRequest):
+    """
+    Create a job posting (for testing/admin purposes)
+    Note: company_id must exist in companies table
+    """
+    try:
+        client = db.get_supabase_client()
+        
+        # Create job record
+        job_data = {
+            "company_id": request.company_id,
+            "title": request.title,
+            "description": request.description,
+            "location": request.location,
+            "remote_allowed": request.remote_allowed,
+            "experience_level": request.experience_level,
+            "salary_min": request.salary_min,
+            "salary_max": request.salary_max,
+        }
+        
+        job_response = client.table("jobs").insert(job_data).execute()
+        
+        if not job_response.data:
+            raise HTTPException(status_code=500, detail="Failed to create job")
+        
+        job_id = job_response.data[0]["id"]
+        
+        # Link required and preferred skills
+        for skill_name, is_required in (
+            [(name, True) for name in request.required_skills] +
+            [(name, False) for name in request.preferred_skills]
+        ):
+            client.table("job_skills").insert({
+                "job_id": job_id,
+                "skill_id": _get_or_create_skill(client, skill_name),
+                "proficiency_level": 3,
+                "is_required": is_required
+            }).execute()
+        
+        skill_similarity.jobs.upsert(str(job_id), request.required_skills + request.preferred_skills)
+        
+        # Pull the new row (and its skills) into the snapshot, if serving from one
+        await db.refresh_snapshot()
+        
+        # And onto the shard that owns it, if matching is sharded
+        await reload_shard(str(job_id))
+        
+        # Compute its matches now so the first read is served from the store
+        match_job = _queue_matches("job", str(job_id))
+        
+        return {
+            "success": True,
+            "job_id": job_id,
+            "match_job": match_job,
+            "message": "Job posting created successfully"
+        }
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating job: {str(e)}")
+
+@router.get("/match-jobs")
+async def match_queue_stats():
+    """
+    Background match queue: workers, pending jobs and job counts by state,
+    plus the size of the precomputed match store
+    """
+    queue = get_match_queue()
+    return {**queue.stats(), "precomputed": queue.store.stats()}
+
+@router.get("/match-jobs/{job_id}", response_model=MatchJobStatus)
+async def match_job_status(job_id: str):
+    """
+    Status of a background match computation (returned by create-talent / create-job)
+    """
+    job = get_match_queue().status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Match job '{job_id}' not found")
+    return job
+
 @router.get("/profiles")
 async def list_profiles():
     """
@@ -94,50 +218,61 @@ async def list_profiles():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching profiles: {str(e)}")
 
+# Same select as the frontend's talent query; only ever fetched as a one-row sample
+TALENT_FULL_SELECT = "*, profile:profiles(id, full_name), talent_skills(skill:skills(name))"
+PROFILE_ROLES = ("talent", "company", "admin")
+
+async def _exact_count(query) -> int:
+    """Run a count=exact query (see db.count_query) off the event loop"""
+    response = await asyncio.to_thread(query.execute)
+    return response.count or 0
+
 @router.get("/check-data")
-async def check_database_data():
+async def check_database_data(sample: bool = Query(False, description="Include one full talent row")):
     """
     Check what data exists in the database
+    Every figure is a server-side exact count, and the queries run concurrently.
     """
     try:
         client = db.get_supabase_client()
         
-        # Try different queries to diagnose the issue
-        profiles = client.table("profiles").select("id, role").execute()
-        
-        # Try simple talent query
-        talents_simple = client.table("talents").select("id").execute()
-        
-        # Try with profile join
-        talents_with_profile = client.table("talents").select("id, profile:profiles(full_name)").execute()
-        
-        # Try full query like frontend
-        talents_full = client.table("talents").select(
-            "*, profile:profiles(id, full_name), talent_skills(skill:skills(name))"
-        ).execute()
+        queries = [
+            db.count_query(client, "profiles"),
+            *[db.count_query(client, "profiles").eq("role", role) for role in PROFILE_ROLES],
+            db.count_query(client, "talents"),
+            # Inner join: talents whose profile is visible (differs from the simple count under RLS)
+            db.count_query(client, "talents", "id, profile:profiles!inner(id)"),
+            db.count_query(client, "talents", TALENT_FULL_SELECT),
+            db.count_query(client, "companies"),
+            db.count_query(client, "jobs"),
+            db.count_query(client, "skills"),
+        ]
+        tasks = [_exact_count(query) for query in queries]
+        if sample:
+            tasks.append(asyncio.to_thread(
+                client.table("talents").select(TALENT_FULL_SELECT).limit(1).execute
+            ))
+        results = await asyncio.gather(*tasks)
         
-        companies = client.table("companies").select("id").execute()
-        jobs = client.table("jobs").select("id").execute()
-        skills = client.table("skills").select("id").execute()
+        profiles_total, *role_counts = results[:1 + len(PROFILE_ROLES)]
+        talents_simple, talents_with_profile, talents_full, companies, jobs, skills = (
+            results[1 + len(PROFILE_ROLES):len(queries)]
+        )
         
         return {
             "profiles": {
-                "total": len(profiles.data),
-                "by_role": {
-                    "talent": len([p for p in profiles.data if p.get("role") == "talent"]),
-                    "company": len([p for p in profiles.data if p.get("role") == "company"]),
-                    "admin": len([p for p in profiles.data if p.get("role") == "admin"])
-                }
+                "total": profiles_total,
+                "by_role": dict(zip(PROFILE_ROLES, role_counts))
             },
             "talents_queries": {
-                "simple_select": len(talents_simple.data),
-                "with_profile_join": len(talents_with_profile.data),
-                "full_query": len(talents_full.data),
-                "sample_data": talents_full.data[:1] if talents_full.data else None
+                "simple_select": talents_simple,
+                "with_profile_join": talents_with_profile,
+                "full_query": talents_full,
+                "sample_data": (results[-1].data or None) if sample else None
             },
-            "companies": len(companies.data),
-            "jobs": len(jobs.data),
-            "skills": len(skills.data),
+            "companies": companies,
+            "jobs": jobs,
+            "skills": skills,
             "diagnosis": "Check if talents_queries shows different counts - this indicates RLS or join issues"
         }
     except Exception as e:
@@ -1,11 +1,100 @@
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import List, Optional
-from models import MatchResult, MatchRequest
-import database_simple as db
-from matching_engine import matching_engine
+from admission import release_early
+from models import MatchResult, MatchRequest, MatchFilters, ExperienceLevel, SimilarityResult
+import database as db
+from match_analytics import match_analytics
+from matching_engine import ScanResult, matching_engine
+from responses import FastJSONResponse, match_results_response
+from config import get_settings
+from scoring_profiles import CompiledProfile, DEFAULT_PROFILE, DEFAULT_PROFILE_NAME, get_profile_registry
+from similarity import skill_similarity, job_skills
+from sharding import ShardError, get_shard_pool
+from singleflight import SingleFlight
+from work_queue import MatchWorkQueue, PrecomputedMatches
 
 router = APIRouter()
 
+# Identical concurrent match requests (same entity, limit, filters, profile) share one computation
+match_flight = SingleFlight(ttl=2.0)
+
+async def _precompute_matches(kind: str, entity_id: str, limit: int) -> List[MatchResult]:
+    """Default-profile, unfiltered top matches for a new talent or job"""
+    if kind == "talent":
+        scan = await _compute_talent_matches(entity_id, limit, MatchFilters(), DEFAULT_PROFILE)
+    else:
+        scan = await _compute_job_matches(entity_id, limit, MatchFilters(), DEFAULT_PROFILE)
+    return scan.results
+
+_match_queue: Optional[MatchWorkQueue] = None
+
+def get_match_queue() -> MatchWorkQueue:
+    """Background queue computing matches for newly created talents/jobs (see routers/admin.py)"""
+    global _match_queue
+    if _match_queue is None:
+        settings = get_settings()
+        _match_queue = MatchWorkQueue(
+            _precompute_matches,
+            PrecomputedMatches(
+                top_n=settings.precomputed_matches,
+                ttl=settings.precomputed_ttl_seconds,
+                min_score=settings.precomputed_min_score
+            ),
+            workers=settings.match_queue_workers,
+            max_pending=settings.match_queue_size
+        )
+    return _match_queue
+
+def _precomputed(kind: str, entity_id: str, limit: int, filters: MatchFilters, profile: CompiledProfile):
+    """Stored top matches, if the request is one the work queue precomputes"""
+    if profile.name != DEFAULT_PROFILE_NAME or not filters.is_empty():
+        return None
+    if _match_queue is None:
+        return None
+    return _match_queue.store.get(kind, entity_id, limit)
+
+def match_filters(
+    remote_only: bool = Query(default=False, description="Only remote-compatible candidates"),
+    experience_level: Optional[ExperienceLevel] = Query(default=None),
+    salary_min: Optional[float] = Query(default=None, ge=0, description="Salary band lower bound"),
+    salary_max: Optional[float] = Query(default=None, ge=0, description="Salary band upper bound"),
+    location: Optional[str] = Query(default=None, description="Case-insensitive location substring")
+) -> MatchFilters:
+    """Candidate filters, pushed down to the data layer so excluded rows are never fetched"""
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        raise HTTPException(status_code=422, detail="salary_min must not exceed salary_max")
+    if location and "*" in location:
+        # PostgREST reads "*" in like patterns as a wildcard, and it can't be escaped
+        raise HTTPException(status_code=422, detail="location must not contain '*'")
+    return MatchFilters(
+        remote_only=remote_only,
+        experience_level=experience_level,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        location=location or None
+    )
+
+def scoring_profile(
+    profile: Optional[str] = Query(default=None, description="Scoring profile name (default profile if omitted)")
+) -> CompiledProfile:
+    """Resolve the requested scoring profile, compiled once at registration"""
+    try:
+        return get_profile_registry().get(profile)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Scoring profile '{profile}' not found. Use GET /api/matching/profiles to see available profiles."
+        )
+
+@router.get("/profiles")
+async def list_scoring_profiles():
+    """
+    List the names of the available scoring profiles
+    """
+    return {"profiles": get_profile_registry().names()}
+
 @router.get("/talents")
 async def list_talents():
     """
@@ -13,7 +102,7 @@ async def list_talents():
     """
     try:
         talents = await db.get_all_talents()
-        return {
+        return FastJSONResponse({
             "count": len(talents),
             "talents": [
                 {
@@ -26,7 +115,7 @@ async def list_talents():
                 }
                 for t in talents
             ]
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching talents: {str(e)}")
 
@@ -37,7 +126,7 @@ async def list_jobs():
     """
     try:
         jobs = await db.get_all_jobs()
-        return {
+        return FastJSONResponse({
             "count": len(jobs),
             "jobs": [
                 {
@@ -50,38 +139,159 @@ async def list_jobs():
                 }
                 for j in jobs
             ]
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
+async def _compute_talent_matches(
+    talent_id: str,
+    limit: int,
+    filters: MatchFilters,
+    profile: CompiledProfile,
+    deadline: Optional[float] = None
+) -> ScanResult:
+    """
+    Load a talent and the jobs passing `filters`, and return the top `limit` matches
+    Scoring runs in a worker thread so cheap routes keep being served meanwhile
+    With a `deadline` (time.monotonic()), the best matches found by then are returned,
+    covering loading as well as scoring
+    """
+    # Get talent profile
+    try:
+        talent = await _until(db.get_talent_by_id(talent_id), deadline)
+    except TimeoutError:
+        return ScanResult([], 0, 0, cut_short=True)
+    if not talent:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Talent with ID '{talent_id}' not found. Use GET /api/matching/talents to see available talents."
+        )
+    
+    # Sharded mode: each shard scores its own jobs, and the top results are merged
+    shards = get_shard_pool()
+    if shards is not None:
+        try:
+            scan = await shards.match_talent_to_jobs(talent, limit, filters, profile, deadline)
+            return _record("talent", talent_id, scan, profile)
+        except ShardError as e:
+            print(f"Sharded matching failed, scoring in-process: {e}")
+    
+    # Get candidate jobs (filtered in the data layer)
+    try:
+        jobs = await _until(db.get_all_jobs(filters, deadline), deadline)
+    except TimeoutError:
+        return ScanResult([], 0, 0, cut_short=True)
+    if not jobs:
+        return ScanResult([], 0, 0)
+    
+    # Perform matching, keeping only the top N results
+    scan = await asyncio.to_thread(
+        matching_engine.scan_talent_to_jobs, talent, jobs, limit=limit, profile=profile, deadline=deadline
+    )
+    return _record("talent", talent_id, scan, profile)
+
+async def _compute_job_matches(
+    job_id: str,
+    limit: int,
+    filters: MatchFilters,
+    profile: CompiledProfile,
+    deadline: Optional[float] = None
+) -> ScanResult:
+    """
+    Load a job and the talents passing `filters`, and return the top `limit` matches
+    Scoring runs in a worker thread so cheap routes keep being served meanwhile
+    With a `deadline` (time.monotonic()), the best matches found by then are returned,
+    covering loading as well as scoring
+    """
+    # Get job posting
+    try:
+        job = await _until(db.get_job_by_id(job_id), deadline)
+    except TimeoutError:
+        return ScanResult([], 0, 0, cut_short=True)
+    if not job:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Job with ID '{job_id}' not found. Use GET /api/matching/jobs to see available jobs."
+        )
+    
+    # Sharded mode: each shard scores its own talents, and the top results are merged
+    shards = get_shard_pool()
+    if shards is not None:
+        try:
+            scan = await shards.match_job_to_talents(job, limit, filters, profile, deadline)
+            return _record("job", job_id, scan, profile)
+        except ShardError as e:
+            print(f"Sharded matching failed, scoring in-process: {e}")
+    
+    # Get candidate talents (filtered in the data layer)
+    try:
+        talents = await _until(db.get_all_talents(filters, deadline), deadline)
+    except TimeoutError:
+        return ScanResult([], 0, 0, cut_short=True)
+    if not talents:
+        return ScanResult([], 0, 0)
+    
+    # Perform matching, keeping only the top N results
+    scan = await asyncio.to_thread(
+        matching_engine.scan_job_to_talents, job, talents, limit=limit, profile=profile, deadline=deadline
+    )
+    return _record("job", job_id, scan, profile)
+
+def _record(kind: str, entity_id: str, scan: ScanResult, profile: CompiledProfile) -> ScanResult:
+    """Feed computed matches into the /stats aggregates (default profile only, so scores are comparable)"""
+    if profile.name == DEFAULT_PROFILE_NAME:
+        match_analytics.record(kind, entity_id, scan.results, scan.scanned, scan.total, scan.partial)
+    return scan
+
+async def _until(awaitable, deadline: Optional[float]):
+    """Await a load, raising TimeoutError once `deadline` passes (if one is set)"""
+    if deadline is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, max(deadline - time.monotonic(), 0))
+
+def _deadline(time_budget_ms: Optional[int]) -> Optional[float]:
+    return time.monotonic() + time_budget_ms / 1000 if time_budget_ms else None
+
+def _scan_response(scan: ScanResult) -> Response:
+    """Match results, flagged as partial (with the share of candidates scored) if the time budget ran out"""
+    return match_results_response(scan.results, headers={
+        "X-Match-Partial": "true" if scan.partial else "false",
+        "X-Match-Coverage": f"{scan.coverage:.4f}"
+    })
+
 @router.post("/talent/{talent_id}/jobs", response_model=List[MatchResult])
 async def match_talent_to_jobs(
+    request: Request,
     talent_id: str,
-    limit: int = Query(default=10, ge=1, le=100)
+    limit: int = Query(default=10, ge=1, le=100),
+    filters: MatchFilters = Depends(match_filters),
+    profile: CompiledProfile = Depends(scoring_profile),
+    time_budget_ms: Optional[int] = Query(
+        default=None, ge=1, le=60000,
+        description="Return the best matches found within this many milliseconds"
+    )
 ):
     """
     Match a talent profile to available jobs
     Returns top matching jobs sorted by match score
+    Optional filters (remote, level, salary band, location) exclude jobs before scoring
+    Concurrent identical requests share a single computation
+    With time_budget_ms, likely matches (most shared skills) are scored first and the
+    best found in time are returned; X-Match-Partial / X-Match-Coverage report how much
+    of the candidate set was scored
     """
     try:
-        # Get talent profile
-        talent = await db.get_talent_by_id(talent_id)
-        if not talent:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Talent with ID '{talent_id}' not found. Use GET /api/matching/talents to see available talents."
-            )
-        
-        # Get all jobs
-        jobs = await db.get_all_jobs()
-        if not jobs:
-            return []
-        
-        # Perform matching
-        results = matching_engine.match_talent_to_jobs(talent, jobs)
-        
-        # Return top N results
-        return results[:limit]
+        results = _precomputed("talent", talent_id, limit, filters, profile)
+        if results is not None:
+            return _scan_response(ScanResult(results, 1, 1))
+        deadline = _deadline(time_budget_ms)
+        scan = await match_flight.do(
+            ("talent", talent_id, limit, filters.cache_key(), profile.name, time_budget_ms),
+            lambda: _compute_talent_matches(talent_id, limit, filters, profile, deadline=deadline),
+            # Followers only wait for the leader's scan: don't hold a match slot meanwhile
+            on_shared=lambda: release_early(request)
+        )
+        return _scan_response(scan)
     except HTTPException:
         raise
     except Exception as e:
@@ -89,32 +299,37 @@ async def match_talent_to_jobs(
 
 @router.post("/job/{job_id}/talents", response_model=List[MatchResult])
 async def match_job_to_talents(
+    request: Request,
     job_id: str,
-    limit: int = Query(default=10, ge=1, le=100)
+    limit: int = Query(default=10, ge=1, le=100),
+    filters: MatchFilters = Depends(match_filters),
+    profile: CompiledProfile = Depends(scoring_profile),
+    time_budget_ms: Optional[int] = Query(
+        default=None, ge=1, le=60000,
+        description="Return the best matches found within this many milliseconds"
+    )
 ):
     """
     Match a job posting to available talents
     Returns top matching talents sorted by match score
+    Optional filters (remote, level, salary band, location) exclude talents before scoring
+    Concurrent identical requests share a single computation
+    With time_budget_ms, likely matches (most shared skills) are scored first and the
+    best found in time are returned; X-Match-Partial / X-Match-Coverage report how much
+    of the candidate set was scored
     """
     try:
-        # Get job posting
-        job = await db.get_job_by_id(job_id)
-        if not job:
-            raise HTTPException(
-                status_code=404, 
-                detail=f"Job with ID '{job_id}' not found. Use GET /api/matching/jobs to see available jobs."
-            )
-        
-        # Get all talents
-        talents = await db.get_all_talents()
-        if not talents:
-            return []
-        
-        # Perform matching
-        results = matching_engine.match_job_to_talents(job, talents)
-        
-        # Return top N results
-        return results[:limit]
+        results = _precomputed("job", job_id, limit, filters, profile)
+        if results is not None:
+            return _scan_response(ScanResult(results, 1, 1))
+        deadline = _deadline(time_budget_ms)
+        scan = await match_flight.do(
+            ("job", job_id, limit, filters.cache_key(), profile.name, time_budget_ms),
+            lambda: _compute_job_matches(job_id, limit, filters, profile, deadline=deadline),
+            # Followers only wait for the leader's scan: don't hold a match slot meanwhile
+            on_shared=lambda: release_early(request)
+        )
+        return _scan_response(scan)
     except HTTPException:
         raise
     except Exception as e:
@@ -123,7 +338,8 @@ async def match_job_to_talents(
 @router.get("/talent/{talent_id}/job/{job_id}", response_model=MatchResult)
 async def match_talent_to_specific_job(
     talent_id: str,
-    job_id: str
+    job_id: str,
+    profile: CompiledProfile = Depends(scoring_profile)
 ):
     """
     Calculate match score between a specific talent and job
@@ -139,27 +355,83 @@ async def match_talent_to_specific_job(
             raise HTTPException(status_code=404, detail=f"Job with ID '{job_id}' not found")
         
         # Perform matching
-        results = matching_engine.match_talent_to_jobs(talent, [job])
+        results = matching_engine.match_talent_to_jobs(talent, [job], profile=profile)
         
         if not results:
             raise HTTPException(status_code=500, detail="Matching failed")
         
-        return results[0]
+        return FastJSONResponse(results[0])
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Matching error: {str(e)}")
 
+@router.get("/talent/{talent_id}/similar", response_model=List[SimilarityResult])
+async def similar_talents(
+    talent_id: str,
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    """
+    Find talents with similar skill sets ("candidates like this one")
+    Approximate nearest neighbours by Jaccard similarity, via a MinHash LSH index
+    """
+    talent = await db.get_talent_by_id(talent_id)
+    if not talent:
+        raise HTTPException(status_code=404, detail=f"Talent with ID '{talent_id}' not found")
+    
+    await skill_similarity.ensure_fresh()
+    skill_similarity.talents.upsert(talent.id, talent.skills)
+    neighbours = skill_similarity.talents.query(talent.skills, limit=limit, exclude=talent.id)
+    return FastJSONResponse([
+        SimilarityResult(talent_id=key, similarity=score, shared_skills=shared)
+        for key, score, shared in neighbours
+    ])
+
+@router.get("/job/{job_id}/similar", response_model=List[SimilarityResult])
+async def similar_jobs(
+    job_id: str,
+    limit: int = Query(default=10, ge=1, le=100)
+):
+    """
+    Find jobs with similar skill requirements ("jobs like this one")
+    Approximate nearest neighbours by Jaccard similarity, via a MinHash LSH index
+    """
+    job = await db.get_job_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job with ID '{job_id}' not found")
+    
+    await skill_similarity.ensure_fresh()
+    skills = job_skills(job)
+    skill_similarity.jobs.upsert(job.id, skills)
+    neighbours = skill_similarity.jobs.query(skills, limit=limit, exclude=job.id)
+    return FastJSONResponse([
+        SimilarityResult(job_id=key, similarity=score, shared_skills=shared)
+        for key, score, shared in neighbours
+    ])
+
 @router.get("/stats")
 async def get_matching_stats():
     """
     Get matching system statistics
+    Table sizes are counted without loading rows; match aggregates (score
+    histograms, top missing skills, coverage) are kept up to date as matches
+    are computed, so this never scores anything
     """
-    talents = await db.get_all_talents()
-    jobs = await db.get_all_jobs()
+    total_talents, total_jobs = await asyncio.gather(db.count("talents"), db.count("jobs"))
     
-    return {
-        "total_talents": len(talents),
-        "total_jobs": len(jobs),
-        "status": "operational"
-    }
+    return FastJSONResponse({
+        "total_talents": total_talents,
+        "total_jobs": total_jobs,
+        "status": "operational",
+        "matches": match_analytics.summary(total_talents, total_jobs)
+    })
+
+@router.get("/stats/jobs/{job_id}")
+async def get_job_match_stats(job_id: str):
+    """
+    Average match score of a job over the matches computed for it so far
+    """
+    stats = match_analytics.job_average(job_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"No matches computed for job '{job_id}' yet")
+    return stats
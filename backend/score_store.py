@@ -0,0 +1,184 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import MatchResult
+
+# Component order in a row's interleaved component array
+COMPONENTS = ("skill", "experience", "location", "salary", "text")
+
+# Component encodings: typecode -> (scale, missing sentinel)
+#   "H": centi-points, exact at the 2 decimals results carry
+#   "B": half-points rounded down, half the size; whole-number thresholds
+#        (e.g. "skill score >= 80") still compare the same way
+COMPONENT_TYPES = {"H": (100, 0xFFFF), "B": (2, 0xFF)}
+
+class _Interned:
+    """Strings mapped to small integer codes, shared by every row of a store"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            if code >= self.limit:
+                raise ValueError(f"Too many distinct values to intern (limit {self.limit})")
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+class _Row:
+    """One entity's stored matches, best first, as parallel contiguous arrays"""
+    __slots__ = ("counterparts", "scores", "components", "reasons", "skill_ends", "matched_counts", "skills", "dropped")
+
+    def __init__(self, component_type: str):
+        self.counterparts = array("I")        # interned talent/job id of the other side
+        self.scores = array("H")              # overall match score, centi-points
+        self.components = array(component_type)  # len(COMPONENTS) per pair
+        self.reasons = array("H")             # interned reason text
+        self.skill_ends = array("I")          # end offset of each pair's skills in `skills`
+        self.matched_counts = array("H")      # leading matched skills; the rest are missing
+        self.skills = array("H")              # interned skill names
+        self.dropped = 0                      # pairs below the threshold, not stored
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def nbytes(self) -> int:
+        return sum(
+            values.itemsize * len(values)
+            for values in (
+                self.counterparts, self.scores, self.components, self.reasons,
+                self.skill_ends, self.matched_counts, self.skills
+            )
+        )
+
+class CompactScoreStore:
+    """
+    Match results per talent/job, quantized into contiguous arrays
+    A pair costs 24 bytes (19 with "B" components) plus 2 per skill name,
+    instead of a MatchResult with float fields and string lists. Ids, skill names and reasons
+    are interned once per store. Pairs scoring below `threshold` are not
+    stored at all (only counted), so sparse rows stay small; MatchResult
+    objects are rebuilt on read.
+    """
+
+    def __init__(self, threshold: float = 0.0, component_type: str = "H"):
+        if component_type not in COMPONENT_TYPES:
+            raise ValueError(f"component_type must be one of {sorted(COMPONENT_TYPES)}")
+        self.threshold = threshold
+        self.component_type = component_type
+        self._scale, self._missing = COMPONENT_TYPES[component_type]
+        self._rows: Dict[Tuple[str, str], _Row] = {}
+        self._ids = _Interned(0xFFFFFFFF)
+        self._skills = _Interned(0xFFFF)
+        self._reasons = _Interned(0xFFFF)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._rows
+
+    def put(self, kind: str, entity_id: str, results: Iterable[MatchResult]):
+        """Replace the stored matches of a talent ("talent") or job ("job")"""
+        if kind not in ("talent", "job"):
+            raise ValueError(f"Unknown match kind '{kind}'")
+        row = _Row(self.component_type)
+        for result in sorted(results, key=lambda result: result.match_score, reverse=True):
+            if result.match_score < self.threshold:
+                row.dropped += 1
+                continue
+            counterpart = result.job_id if kind == "talent" else result.talent_id
+            row.counterparts.append(self._ids.code(counterpart))
+            row.scores.append(round(result.match_score * 100))
+            row.components.extend(self._quantize(score) for score in (
+                result.skill_match_score, result.experience_match_score, result.location_match_score,
+                result.salary_match_score, result.text_match_score
+            ))
+            row.reasons.append(self._reasons.code(result.reason))
+            row.skills.extend(self._skills.code(skill) for skill in result.matched_skills)
+            row.skills.extend(self._skills.code(skill) for skill in result.missing_skills)
+            row.matched_counts.append(len(result.matched_skills))
+            row.skill_ends.append(len(row.skills))
+        self._rows[(kind, entity_id)] = row
+
+    def get(
+        self,
+        kind: str,
+        entity_id: str,
+        limit: Optional[int] = None,
+        min_score: Optional[float] = None
+    ) -> Optional[List[MatchResult]]:
+        """Stored matches best first (top `limit`, at least `min_score`), or None if none are stored"""
+        row = self._rows.get((kind, entity_id))
+        if row is None:
+            return None
+        end = len(row) if limit is None else min(limit, len(row))
+        if min_score is not None:
+            floor = round(min_score * 100)
+            while end and row.scores[end - 1] < floor:
+                end -= 1
+        return [self._result(kind, row, i) for i in range(end)]
+
+    def stored(self, kind: str, entity_id: str) -> Optional[Tuple[int, int]]:
+        """(stored pairs, pairs dropped below the threshold), or None if none are stored"""
+        row = self._rows.get((kind, entity_id))
+        return None if row is None else (len(row), row.dropped)
+
+    def discard(self, kind: str, entity_id: str):
+        self._rows.pop((kind, entity_id), None)
+
+    def clear(self):
+        self._rows.clear()
+
+    def stats(self) -> dict:
+        pairs = sum(len(row) for row in self._rows.values())
+        array_bytes = sum(row.nbytes() for row in self._rows.values())
+        return {
+            "entities": len(self._rows),
+            "pairs": pairs,
+            "dropped_pairs": sum(row.dropped for row in self._rows.values()),
+            "array_bytes": array_bytes,
+            "bytes_per_pair": round(array_bytes / pairs, 1) if pairs else None,
+            "interned": {"ids": len(self._ids.values), "skills": len(self._skills.values)}
+        }
+
+    def _quantize(self, score: Optional[float]) -> int:
+        if score is None:
+            return self._missing
+        if self._scale == 100:
+            return round(score * 100)
+        # Round down so comparisons against whole-number thresholds are unchanged
+        return int(score * self._scale)
+
+    def _dequantize(self, value: int) -> Optional[float]:
+        if value == self._missing:
+            return None
+        return value / self._scale
+
+    def _result(self, kind: str, row: _Row, i: int) -> MatchResult:
+        counterpart = self._ids.values[row.counterparts[i]]
+        skill, experience, location, salary, text = (
+            self._dequantize(value) for value in row.components[i * len(COMPONENTS):(i + 1) * len(COMPONENTS)]
+        )
+        start = row.skill_ends[i - 1] if i else 0
+        split = start + row.matched_counts[i]
+        names = self._skills.values
+        # Fields were validated when first built; skip validating them again
+        return MatchResult.model_construct(
+            # Like the engine's results, only the other side's id is set
+            talent_id=None if kind == "talent" else counterpart,
+            job_id=counterpart if kind == "talent" else None,
+            match_score=row.scores[i] / 100,
+            skill_match_score=skill,
+            experience_match_score=experience,
+            location_match_score=location,
+            salary_match_score=salary,
+            text_match_score=text,
+            matched_skills=[names[code] for code in row.skills[start:split]],
+            missing_skills=[names[code] for code in row.skills[split:row.skill_ends[i]]],
+            reason=self._reasons.values[row.reasons[i]]
+        )
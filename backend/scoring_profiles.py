@@ -0,0 +1,162 @@
+import json
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from pydantic import BaseModel, Field, model_validator
+from config import get_settings
+
+class ScoringWeights(BaseModel):
+    """Share of each component in the overall match score; must sum to 1"""
+    skills: float = Field(default=0.40, ge=0, le=1)
+    experience: float = Field(default=0.30, ge=0, le=1)
+    location: float = Field(default=0.20, ge=0, le=1)
+    salary: float = Field(default=0.10, ge=0, le=1)
+    # Optional title/bio TF-IDF similarity; skipped entirely when 0
+    text: float = Field(default=0.0, ge=0, le=1)
+
+    @model_validator(mode="after")
+    def check_total(self):
+        total = self.skills + self.experience + self.location + self.salary + self.text
+        if abs(total - 1) > 1e-6:
+            raise ValueError(f"weights must sum to 1 (got {total:g})")
+        return self
+
+class SkillThresholds(BaseModel):
+    # Points for matching every required skill; preferred skills get the rest of 100
+    required_points: float = Field(default=70, ge=0, le=100)
+
+class ExperienceThresholds(BaseModel):
+    # Level points by distance between talent and job level (0, 1, 2+)
+    level_exact: float = Field(default=60, ge=0, le=100)
+    level_one_off: float = Field(default=40, ge=0, le=100)
+    level_far: float = Field(default=20, ge=0, le=100)
+    # Years points when the talent is within the job's range
+    years_points: float = Field(default=40, ge=0, le=100)
+    overqualified_penalty_per_year: float = Field(default=5, ge=0, le=100)
+    overqualified_floor: float = Field(default=20, ge=0, le=100)
+    underqualified_penalty_per_year: float = Field(default=10, ge=0, le=100)
+
+    @model_validator(mode="after")
+    def check_total(self):
+        # The best level points plus the best years points must fit in 100
+        level = max(self.level_exact, self.level_one_off, self.level_far)
+        years = max(self.years_points, self.overqualified_floor)
+        if level + years > 100:
+            raise ValueError(
+                "max(level_exact, level_one_off, level_far) + "
+                "max(years_points, overqualified_floor) must not exceed 100"
+            )
+        return self
+
+class LocationThresholds(BaseModel):
+    both_remote: float = Field(default=100, ge=0, le=100)
+    remote_job_onsite_talent: float = Field(default=80, ge=0, le=100)
+    onsite_job_remote_talent: float = Field(default=60, ge=0, le=100)
+    # On-site pairs, by how the two normalized locations relate (see locations.py)
+    same_location: float = Field(default=100, ge=0, le=100)
+    nearby_location: float = Field(default=90, ge=0, le=100)
+    similar_location: float = Field(default=80, ge=0, le=100)
+    commute_location: float = Field(default=70, ge=0, le=100)
+    same_region: float = Field(default=50, ge=0, le=100)
+    same_country: float = Field(default=40, ge=0, le=100)
+    different_location: float = Field(default=30, ge=0, le=100)
+
+    def relation_scores(self) -> Tuple[float, ...]:
+        """Scores indexed by location relation (SAME..DIFFERENT)"""
+        return (
+            self.same_location, self.nearby_location, self.similar_location,
+            self.commute_location, self.same_region, self.same_country,
+            self.different_location
+        )
+
+class SalaryThresholds(BaseModel):
+    neutral: float = Field(default=50, ge=0, le=100)
+    job_offers_more: float = Field(default=70, ge=0, le=100)
+    # Assumed max = min * spread when the upper end of a range is missing
+    missing_max_spread: float = Field(default=1.5, ge=1)
+
+class ScoringProfile(BaseModel):
+    """A named set of weights and thresholds used to score matches"""
+    name: str
+    weights: ScoringWeights = ScoringWeights()
+    skills: SkillThresholds = SkillThresholds()
+    experience: ExperienceThresholds = ExperienceThresholds()
+    location: LocationThresholds = LocationThresholds()
+    salary: SalaryThresholds = SalaryThresholds()
+
+    def compile(self) -> "CompiledProfile":
+        w, s, e, l, p = self.weights, self.skills, self.experience, self.location, self.salary
+        return CompiledProfile(
+            self.name,
+            w.skills, w.experience, w.location, w.salary, w.text,
+            s.required_points, 100 - s.required_points,
+            e.level_exact, e.level_one_off, e.level_far, e.years_points,
+            e.overqualified_penalty_per_year, e.overqualified_floor,
+            e.underqualified_penalty_per_year,
+            l.both_remote, l.remote_job_onsite_talent, l.onsite_job_remote_talent,
+            l.relation_scores(),
+            p.neutral, p.job_offers_more, p.missing_max_spread
+        )
+
+class CompiledProfile(NamedTuple):
+    """Flat, immutable form of a ScoringProfile read by the engine's hot loop"""
+    name: str
+    w_skills: float
+    w_experience: float
+    w_location: float
+    w_salary: float
+    w_text: float
+    required_points: float
+    preferred_points: float
+    level_exact: float
+    level_one_off: float
+    level_far: float
+    years_points: float
+    overqualified_penalty_per_year: float
+    overqualified_floor: float
+    underqualified_penalty_per_year: float
+    both_remote: float
+    remote_job_onsite_talent: float
+    onsite_job_remote_talent: float
+    location_scores: Tuple[float, ...]
+    salary_neutral: float
+    salary_job_offers_more: float
+    missing_max_spread: float
+
+DEFAULT_PROFILE_NAME = "default"
+DEFAULT_PROFILE = ScoringProfile(name=DEFAULT_PROFILE_NAME).compile()
+
+class ProfileRegistry:
+    """Named scoring profiles, validated and compiled once when registered"""
+
+    def __init__(self, profiles: Optional[List[ScoringProfile]] = None):
+        self._profiles: Dict[str, CompiledProfile] = {DEFAULT_PROFILE_NAME: DEFAULT_PROFILE}
+        for profile in profiles or []:
+            self.register(profile)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ProfileRegistry":
+        """Load a JSON list of profiles, e.g. [{"name": "acme", "weights": {...}}]"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls([ScoringProfile.model_validate(item) for item in data])
+
+    def register(self, profile: ScoringProfile) -> CompiledProfile:
+        compiled = profile.compile()
+        self._profiles[profile.name] = compiled
+        return compiled
+
+    def get(self, name: Optional[str] = None) -> CompiledProfile:
+        """Get a compiled profile by name (the default profile if no name); KeyError if unknown"""
+        return self._profiles[name or DEFAULT_PROFILE_NAME]
+
+    def names(self) -> List[str]:
+        return list(self._profiles)
+
+_registry: Optional[ProfileRegistry] = None
+
+def get_profile_registry() -> ProfileRegistry:
+    """Registry built from the SCORING_PROFILES_FILE setting on first use"""
+    global _registry
+    if _registry is None:
+        path = get_settings().scoring_profiles_file
+        _registry = ProfileRegistry.from_file(path) if path else ProfileRegistry()
+    return _registry
@@ -0,0 +1,489 @@
+import asyncio
+import gc
+import heapq
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from itertools import chain
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Callable, List, Optional, Tuple
+import database as db
+from config import get_settings
+from matching_engine import MatchingEngine, ScanResult
+from models import TalentProfile, JobPosting, MatchFilters
+from scoring_profiles import CompiledProfile
+
+# Shard servers answer ("ok", payload) or ("error", message) to each request:
+#   ("ping",)                                          -> {"shard", "talents", "jobs"}
+#   ("match_job", job, limit, filters, profile, budget)        -> ScanResult of local talents
+#   ("match_talent", talent, limit, filters, profile, budget)  -> ScanResult of local jobs
+# `budget` is the seconds left to score in (None: no limit); deadlines are
+# sent as durations because monotonic clocks differ between processes and nodes
+#   ("reload",)                                        -> same as ping, after reloading
+
+class ShardError(RuntimeError):
+    """A scatter failed: a shard was unreachable or answered with an error"""
+
+def shard_of(entity_id: str, shards: int) -> int:
+    """Shard owning a talent/job ID (crc32, so it is stable across processes and nodes)"""
+    return zlib.crc32(entity_id.encode("utf-8")) % shards
+
+class ShardData:
+    """One shard's partition of the talents and jobs, parsed once and kept in memory"""
+
+    def __init__(self, shard: int, shards: int, backend_factory: Callable = db.create_backend):
+        self.shard = shard
+        self.shards = shards
+        self.backend_factory = backend_factory
+        self.engine = MatchingEngine()
+        self._talent_rows: List[db.Row] = []
+        self._talents: List[TalentProfile] = []
+        self._job_rows: List[db.Row] = []
+        self._jobs: List[JobPosting] = []
+        self.loaded_at = 0.0
+
+    def load(self):
+        """(Re)load this shard's rows from the configured data backend"""
+        backend = self.backend_factory()
+        talent_rows = [r for r in backend.fetch_talents() if shard_of(str(r["id"]), self.shards) == self.shard]
+        job_rows = [r for r in backend.fetch_jobs() if shard_of(str(r["id"]), self.shards) == self.shard]
+        talents, jobs = db.parse_talents(talent_rows), db.parse_jobs(job_rows)
+        self._talent_rows, self._talents = talent_rows, talents
+        self._job_rows, self._jobs = job_rows, jobs
+        self.loaded_at = time.monotonic()
+        # The partition lives until the next reload: keep it out of the cyclic
+        # GC so full collections don't stall time-budgeted scans
+        gc.freeze()
+
+    def info(self) -> dict:
+        return {"shard": self.shard, "talents": len(self._talents), "jobs": len(self._jobs)}
+
+    def talents(self, filters: Optional[MatchFilters]) -> List[TalentProfile]:
+        if filters is None or filters.is_empty():
+            return self._talents
+        columns = db.TALENT_FILTER_COLUMNS
+        return [t for row, t in zip(self._talent_rows, self._talents) if db.row_matches(row, filters, columns)]
+
+    def jobs(self, filters: Optional[MatchFilters]) -> List[JobPosting]:
+        if filters is None or filters.is_empty():
+            return self._jobs
+        columns = db.JOB_FILTER_COLUMNS
+        return [j for row, j in zip(self._job_rows, self._jobs) if db.row_matches(row, filters, columns)]
+
+class ShardServer:
+    """
+    Serves one shard over multiprocessing.connection (a Unix socket for local
+    worker processes, TCP for other nodes), one thread per connection.
+    The partition is reloaded every `refresh_seconds`.
+    """
+
+    def __init__(self, data: ShardData, refresh_seconds: float = 600):
+        self.data = data
+        self.refresh_seconds = refresh_seconds
+        self._reload_lock = threading.Lock()
+
+    def serve_forever(self, address, authkey: bytes):
+        self.data.load()
+        with Listener(address, authkey=authkey) as listener:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    # Failed handshake (wrong authkey, dropped client): keep serving
+                    print(f"Shard {self.data.shard}: rejected connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn: Connection):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send(("ok", self._dispatch(request)))
+                except Exception as e:
+                    conn.send(("error", f"{type(e).__name__}: {e}"))
+
+    def _dispatch(self, request: tuple):
+        op = request[0]
+        data = self.data
+        if op == "ping":
+            return data.info()
+        if op == "reload":
+            with self._reload_lock:
+                data.load()
+            return data.info()
+
+        if time.monotonic() - data.loaded_at >= self.refresh_seconds:
+            with self._reload_lock:
+                if time.monotonic() - data.loaded_at >= self.refresh_seconds:
+                    data.load()
+        if op == "match_job":
+            _, job, limit, filters, profile, budget = request
+            return data.engine.scan_job_to_talents(
+                job, data.talents(filters), limit=limit, profile=profile, deadline=_deadline(budget)
+            )
+        if op == "match_talent":
+            _, talent, limit, filters, profile, budget = request
+            return data.engine.scan_talent_to_jobs(
+                talent, data.jobs(filters), limit=limit, profile=profile, deadline=_deadline(budget)
+            )
+        raise ValueError(f"Unknown shard request '{op}'")
+
+def _deadline(budget: Optional[float]) -> Optional[float]:
+    return time.monotonic() + budget if budget is not None else None
+
+def _budget(deadline: Optional[float]) -> Optional[float]:
+    return max(0.0, deadline - time.monotonic()) if deadline is not None else None
+
+def serve(address, authkey: bytes, shard: int, shards: int, backend_factory: Callable = db.create_backend):
+    """Process entry point for a shard server"""
+    ShardServer(ShardData(shard, shards, backend_factory)).serve_forever(address, authkey)
+
+class ShardClient:
+    """Pooled connections to one shard server; each connection serves one call at a time"""
+
+    def __init__(self, address, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._idle: List[Connection] = []
+        self._lock = threading.Lock()
+
+    def call(self, request: tuple):
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+        try:
+            conn.send(request)
+            status, payload = conn.recv()
+        except BaseException:
+            conn.close()
+            raise
+        with self._lock:
+            self._idle.append(conn)
+        if status != "ok":
+            raise RuntimeError(f"Shard {self.address}: {payload}")
+        return payload
+
+    def wait_ready(self, timeout: float, alive: Callable[[], bool] = lambda: True) -> dict:
+        """Ping until the server answers (it listens once its partition is loaded)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.call(("ping",))
+            except (ConnectionRefusedError, FileNotFoundError):
+                if not alive():
+                    raise RuntimeError(f"Shard {self.address} exited before it was ready")
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Shard {self.address} not ready after {timeout:g}s")
+                time.sleep(0.1)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+class ShardPool:
+    """
+    Scatter-gather matching over shard servers
+    Every candidate lives on exactly one shard (crc32 of its ID modulo the
+    shard count). A match request is sent to every shard in parallel, each
+    shard returns its local top `limit`, and the pool merges them into the
+    global top `limit`. Equal scores may come back in a different order than
+    a single-process scan. When a shard can't be reached the pool stops being
+    ready (so matching falls back in-process), respawns dead local shards and
+    becomes ready again once every shard answers.
+    """
+
+    def __init__(
+        self,
+        clients: List[ShardClient],
+        processes: Optional[List[multiprocessing.Process]] = None,
+        spawn: Optional[Callable[[int], multiprocessing.Process]] = None
+    ):
+        self.clients = clients
+        self.processes = processes or []
+        self.ready = False
+        self._spawn = spawn
+        self._socket_dir: Optional[str] = None
+        self._stopped = False
+        self._recovering = threading.Lock()
+
+    @classmethod
+    def local(
+        cls,
+        shards: int,
+        authkey: Optional[bytes] = None,
+        backend_factory: Callable = db.create_backend
+    ) -> "ShardPool":
+        """Spawn one shard server process per shard, listening on Unix sockets"""
+        authkey = authkey or os.urandom(16)
+        socket_dir = tempfile.mkdtemp(prefix="talentbrains-shards-")
+        context = multiprocessing.get_context("spawn")
+        addresses = [os.path.join(socket_dir, f"shard-{shard}.sock") for shard in range(shards)]
+
+        def spawn(shard: int) -> multiprocessing.Process:
+            # A dead server leaves its socket file behind, which would fail the bind
+            if os.path.exists(addresses[shard]):
+                os.unlink(addresses[shard])
+            process = context.Process(
+                target=serve,
+                args=(addresses[shard], authkey, shard, shards, backend_factory),
+                name=f"match-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            return process
+
+        processes = [spawn(shard) for shard in range(shards)]
+        pool = cls([ShardClient(address, authkey) for address in addresses], processes, spawn)
+        pool._socket_dir = socket_dir
+        return pool
+
+    @classmethod
+    def remote(cls, addresses: List[Tuple[str, int]], authkey: bytes) -> "ShardPool":
+        """Connect to shard servers started with `python sharding.py serve`, in shard order"""
+        return cls([ShardClient(address, authkey) for address in addresses])
+
+    def wait_ready(self, timeout: float = 120) -> List[dict]:
+        infos = [client.wait_ready(timeout, self._alive) for client in self.clients]
+        self.ready = True
+        return infos
+
+    def _alive(self) -> bool:
+        """False once any local shard process has exited"""
+        return all(process.is_alive() for process in self.processes)
+
+    def _lost(self, error: BaseException):
+        """Stop routing matches to the shards and recover them in the background"""
+        if self._stopped or not self._recovering.acquire(blocking=False):
+            return
+        self.ready = False
+        print(f"Sharded matching unavailable, scoring in-process until shards recover: {error}")
+        threading.Thread(target=self._recover, name="match-shard-recovery", daemon=True).start()
+
+    def _recover(self):
+        try:
+            while not self._stopped:
+                try:
+                    # Pooled connections may point at dead servers
+                    for client in self.clients:
+                        client.close()
+                    for shard, process in enumerate(self.processes):
+                        if not process.is_alive() and not self._stopped:
+                            process.join(timeout=0)
+                            self.processes[shard] = self._spawn(shard)
+                    infos = [client.wait_ready(120, self._alive) for client in self.clients]
+                    if not self._stopped:
+                        self.ready = True
+                        print(f"Sharded matching ready again: {infos}")
+                    return
+                except Exception as e:
+                    print(f"Shard recovery failed, retrying: {e}")
+                    time.sleep(5)
+        finally:
+            self._recovering.release()
+
+    def stop(self):
+        self._stopped = True
+        self.ready = False
+        for client in self.clients:
+            client.close()
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout=5)
+        if self._socket_dir:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+
+    def scatter(self, request: tuple) -> List:
+        """
+        Send one request to every shard (blocking, in parallel threads)
+        Raises ShardError if any shard fails; an unreachable shard also takes
+        the pool out of service until it recovers.
+        """
+        if len(self.clients) == 1:
+            return [self._call(self.clients[0], request)]
+        results: List = [None] * len(self.clients)
+        errors: List[BaseException] = []
+
+        def call(i, client):
+            try:
+                results[i] = self._call(client, request)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call, args=(i, c)) for i, c in enumerate(self.clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def _call(self, client: ShardClient, request: tuple):
+        try:
+            return client.call(request)
+        except (OSError, EOFError) as e:
+            self._lost(e)
+            raise ShardError(str(e)) from e
+        except RuntimeError as e:
+            raise ShardError(str(e)) from e
+
+    def reload(self, entity_id: str) -> dict:
+        """Reload the shard owning a talent/job ID, so a new or changed row is matched (blocking)"""
+        return self._call(self.clients[shard_of(entity_id, len(self.clients))], ("reload",))
+
+    @staticmethod
+    def merge(partials: List[ScanResult], limit: Optional[int]) -> ScanResult:
+        results = chain.from_iterable(partial.results for partial in partials)
+        if limit is None:
+            merged = sorted(results, key=lambda r: r.match_score, reverse=True)
+        else:
+            merged = heapq.nlargest(limit, results, key=lambda r: r.match_score)
+        return ScanResult(
+            merged,
+            sum(partial.scanned for partial in partials),
+            sum(partial.total for partial in partials),
+            any(partial.cut_short for partial in partials)
+        )
+
+    async def match_job_to_talents(
+        self,
+        job: JobPosting,
+        limit: Optional[int],
+        filters: Optional[MatchFilters],
+        profile: CompiledProfile,
+        deadline: Optional[float] = None
+    ) -> ScanResult:
+        request = ("match_job", job, limit, filters, profile, _budget(deadline))
+        return self.merge(await asyncio.to_thread(self.scatter, request), limit)
+
+    async def match_talent_to_jobs(
+        self,
+        talent: TalentProfile,
+        limit: Optional[int],
+        filters: Optional[MatchFilters],
+        profile: CompiledProfile,
+        deadline: Optional[float] = None
+    ) -> ScanResult:
+        request = ("match_talent", talent, limit, filters, profile, _budget(deadline))
+        return self.merge(await asyncio.to_thread(self.scatter, request), limit)
+
+def _parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.strip().rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+_pool: Optional[ShardPool] = None
+
+def get_shard_pool() -> Optional[ShardPool]:
+    """The shard pool once it is ready, or None (score in-process)"""
+    return _pool if _pool is not None and _pool.ready else None
+
+async def reload_shard(entity_id: str):
+    """Pick up a new or changed talent/job on its shard now, if sharded matching is on (no-op otherwise)"""
+    pool = get_shard_pool()
+    if pool is None:
+        return
+    try:
+        await asyncio.to_thread(pool.reload, entity_id)
+    except ShardError as e:
+        # The shard still reloads on its own every 10 minutes
+        print(f"Shard not reloaded for {entity_id}: {e}")
+
+def start_shards():
+    """
+    Start sharded matching per settings (blocking; run off the event loop)
+    MATCH_SHARD_ADDRESSES connects to remote shard servers; otherwise
+    MATCH_SHARDS > 0 spawns that many local worker processes.
+    """
+    global _pool
+    settings = get_settings()
+    if settings.match_shard_addresses:
+        if not settings.match_shard_authkey:
+            raise ValueError("MATCH_SHARD_AUTHKEY must be set to use MATCH_SHARD_ADDRESSES")
+        addresses = [_parse_address(a) for a in settings.match_shard_addresses.split(",") if a.strip()]
+        pool = ShardPool.remote(addresses, settings.match_shard_authkey.encode())
+    elif settings.match_shards > 0:
+        authkey = settings.match_shard_authkey.encode() if settings.match_shard_authkey else None
+        pool = ShardPool.local(settings.match_shards, authkey)
+    else:
+        return
+    _pool = pool
+    infos = pool.wait_ready()
+    print(f"Sharded matching ready: {infos}")
+
+def stop_shards():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.stop()
+
+if __name__ == "__main__":
+    # python sharding.py serve --shard 0 --shards 4 --port 7100   (one per node/shard)
+    # python sharding.py check --shards 4 --talents 100000         (local harness)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sharded matching servers and local test harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="Serve one shard over TCP")
+    serve_parser.add_argument("--shard", type=int, required=True)
+    serve_parser.add_argument("--shards", type=int, required=True)
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, required=True)
+    check_parser = commands.add_parser("check", help="Run local shards on synthetic data and compare with one process")
+    check_parser.add_argument("--shards", type=int, default=4)
+    check_parser.add_argument("--talents", type=int, default=100_000)
+    check_parser.add_argument("--jobs", type=int, default=200)
+    check_parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        authkey = get_settings().match_shard_authkey
+        if not authkey:
+            print("MATCH_SHARD_AUTHKEY must be set")
+            sys.exit(1)
+        serve((args.host, args.port), authkey.encode(), args.shard, args.shards)
+
+    from functools import partial
+    from scoring_profiles import DEFAULT_PROFILE
+
+    factory = partial(db.MemoryBackend.synthetic, args.talents, args.jobs)
+    backend = factory()
+    talents, jobs = db.parse_talents(backend.fetch_talents()), db.parse_jobs(backend.fetch_jobs())
+    engine = MatchingEngine()
+
+    started = time.perf_counter()
+    pool = ShardPool.local(args.shards, backend_factory=factory)
+    try:
+        print(f"Shards: {pool.wait_ready()} (ready in {time.perf_counter() - started:.1f}s)")
+        single_time = sharded_time = 0.0
+        mismatches = 0
+        for job in jobs[:args.queries]:
+            started = time.perf_counter()
+            expected = engine.match_job_to_talents(job, talents, limit=10, profile=DEFAULT_PROFILE)
+            single_time += time.perf_counter() - started
+            started = time.perf_counter()
+            actual = asyncio.run(pool.match_job_to_talents(job, 10, None, DEFAULT_PROFILE)).results
+            sharded_time += time.perf_counter() - started
+            if [r.match_score for r in expected] != [r.match_score for r in actual]:
+                mismatches += 1
+        print(
+            f"{args.queries} job -> talents queries over {len(talents)} talents: "
+            f"single process {single_time / args.queries * 1000:.0f} ms, "
+            f"{args.shards} shards {sharded_time / args.queries * 1000:.0f} ms per query; "
+            f"{mismatches} top-10 score mismatches"
+        )
+    finally:
+        pool.stop()
+    sys.exit(1 if mismatches else 0)
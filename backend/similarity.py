@@ -0,0 +1,152 @@
+import asyncio
+import random
+import time
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import database as db
+from models import TalentProfile, JobPosting
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+def skill_set(skills: Iterable[str]) -> FrozenSet[str]:
+    """Case-insensitive skill set, as compared by the matching engine"""
+    return frozenset(s.lower().strip() for s in skills if s and s.strip())
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class MinHashLSH:
+    """
+    MinHash signatures of skill sets, banded into LSH buckets
+    Entities sharing a bucket in any band are candidate neighbours; candidates
+    are then ranked by exact Jaccard similarity of their skill sets. With the
+    default 16 bands of 4 rows, pairs with Jaccard >= ~0.5 are found with high
+    probability while only a few buckets are read per query.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        self._sets: Dict[str, FrozenSet[str]] = {}
+        self._keys: Dict[str, List[int]] = {}
+        self._buckets: Dict[int, Set[str]] = {}
+        self._hash_cache: Dict[str, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def _skill_hashes(self, skill: str) -> Tuple[int, ...]:
+        """Hash of one skill under every permutation (cached: the skill vocabulary is small)"""
+        hashes = self._hash_cache.get(skill)
+        if hashes is None:
+            # crc32 rather than hash() so signatures are stable across processes
+            h = zlib.crc32(skill.encode("utf-8"))
+            hashes = tuple(((a * h + b) % _PRIME) & _MAX_HASH for a, b in self._perms)
+            self._hash_cache[skill] = hashes
+        return hashes
+
+    def signature(self, skills: FrozenSet[str]) -> List[int]:
+        return list(map(min, zip(*(self._skill_hashes(s) for s in skills))))
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        rows = self.rows
+        return [
+            hash((band, tuple(signature[band * rows:(band + 1) * rows])))
+            for band in range(self.bands)
+        ]
+
+    def upsert(self, key: str, skills: Iterable[str]):
+        """Index (or re-index) an entity's skills"""
+        skills = skill_set(skills)
+        if self._sets.get(key) == skills:
+            return
+        self.remove(key)
+        self._sets[key] = skills
+        if not skills:
+            return
+        band_keys = self._band_keys(self.signature(skills))
+        self._keys[key] = band_keys
+        for band_key in band_keys:
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: str):
+        self._sets.pop(key, None)
+        for band_key in self._keys.pop(key, []):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def query(
+        self,
+        skills: Iterable[str],
+        limit: int = 10,
+        exclude: Optional[str] = None
+    ) -> List[Tuple[str, float, List[str]]]:
+        """Approximate nearest neighbours as (key, jaccard, shared skills), best first"""
+        skills = skill_set(skills)
+        if not skills:
+            return []
+        candidates: Set[str] = set()
+        for band_key in self._band_keys(self.signature(skills)):
+            candidates.update(self._buckets.get(band_key, ()))
+        candidates.discard(exclude)
+
+        scored = [(key, jaccard(skills, self._sets[key])) for key in candidates]
+        scored.sort(key=lambda x: (-x[1], x[0]))
+        return [
+            (key, round(score, 4), sorted(skills & self._sets[key]))
+            for key, score in scored[:limit]
+        ]
+
+class SkillSimilarityIndex:
+    """
+    LSH indexes over talent and job skill sets, built from the repository on
+    first use. Entities are upserted as they are created or looked up, and
+    the whole index is rebuilt every `refresh_seconds` to pick up changes
+    made outside this API (edits and deletions in Supabase).
+    """
+
+    def __init__(self, refresh_seconds: float = 600):
+        self.refresh_seconds = refresh_seconds
+        self.talents = MinHashLSH()
+        self.jobs = MinHashLSH()
+        self._built_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def ensure_fresh(self):
+        if self._built_at is not None and time.monotonic() - self._built_at < self.refresh_seconds:
+            return
+        async with self._lock:
+            if self._built_at is not None and time.monotonic() - self._built_at < self.refresh_seconds:
+                return
+            talents = await db.get_all_talents()
+            jobs = await db.get_all_jobs()
+            # Hashing every entity is CPU-bound; keep it off the event loop
+            self.talents, self.jobs = await asyncio.to_thread(self._build, talents, jobs)
+            self._built_at = time.monotonic()
+
+    @staticmethod
+    def _build(talents: List[TalentProfile], jobs: List[JobPosting]) -> Tuple[MinHashLSH, MinHashLSH]:
+        talent_index = MinHashLSH()
+        for talent in talents:
+            talent_index.upsert(talent.id, talent.skills)
+        job_index = MinHashLSH()
+        for job in jobs:
+            job_index.upsert(job.id, job_skills(job))
+        return talent_index, job_index
+
+def job_skills(job: JobPosting) -> List[str]:
+    return list(job.required_skills) + list(job.preferred_skills or [])
+
+skill_similarity = SkillSimilarityIndex()
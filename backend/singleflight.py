@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight computation.
+
+    Callers that arrive while a computation is running await the same future.
+    The finished result is kept for `ttl` seconds so a burst that lands just
+    after completion is served without recomputing. Failures are never cached.
+    """
+
+    def __init__(self, ttl: float = 2.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_shared: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """Return the result of `fn()`, sharing it with concurrent callers of `key`
+
+        `on_shared` is called, before waiting, when this caller joins a
+        computation another caller is already running.
+        """
+        cached = self._results.get(key)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > time.monotonic():
+                return value
+            del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            # Run as a task so a cancelled caller never cancels shared work
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        elif on_shared is not None:
+            on_shared()
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(key, task.result())
+
+    def _store(self, key: Hashable, value: Any):
+        if self.ttl <= 0:
+            return
+        if len(self._results) >= self.max_entries:
+            now = time.monotonic()
+            self._results = {
+                k: v for k, v in self._results.items() if v[0] > now
+            }
+            if len(self._results) >= self.max_entries:
+                # Still full of live entries: drop the oldest insertion
+                self._results.pop(next(iter(self._results)))
+        self._results[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        """Drop all cached results (in-flight calls are unaffected)"""
+        self._results.clear()
@@ -0,0 +1,18 @@
+import os
+import sys
+import pytest
+
+# The backend runs as flat modules from backend/ (python main.py / uvicorn main:app)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import MemoryBackend, parse_jobs, parse_talents
+
+@pytest.fixture
+def synthetic(request):
+    """
+    Parsed (talents, jobs) from MemoryBackend.synthetic; 40 talents and 8 jobs
+    unless parametrized indirectly with a (talents, jobs) size
+    """
+    talents, jobs = getattr(request, "param", (40, 8))
+    source = MemoryBackend.synthetic(talents, jobs)
+    return parse_talents(source.fetch_talents()), parse_jobs(source.fetch_jobs())
@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from admission import AdmissionController, AdmissionRejected, AdmissionTicket, ConcurrencyLimiter
+from singleflight import SingleFlight
+
+def _controller(client_header=None) -> AdmissionController:
+    return AdmissionController([], {}, client_header=client_header)
+
+def test_client_key_defaults_to_the_peer_address():
+    scope = {"client": ("10.0.0.1", 5000), "headers": [(b"x-forwarded-for", b"1.2.3.4")]}
+    assert _controller().client_key(scope) == "10.0.0.1"
+
+def test_client_key_uses_the_last_entry_of_the_configured_header():
+    controller = _controller("X-Forwarded-For")
+    scope = {"client": ("10.0.0.1", 5000), "headers": [(b"x-forwarded-for", b"6.6.6.6, 1.2.3.4")]}
+    assert controller.client_key(scope) == "1.2.3.4"
+    assert controller.client_key({"client": ("10.0.0.1", 5000), "headers": []}) == "10.0.0.1"
+
+def test_single_flight_followers_give_their_slot_back():
+    async def run():
+        limiter = ConcurrencyLimiter("match", limit=2, max_queue=10, queue_timeout=1)
+        flight = SingleFlight(ttl=0)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "result"
+
+        async def request():
+            await limiter.acquire()
+            ticket = AdmissionTicket(limiter)
+            try:
+                return await flight.do("key", compute, on_shared=lambda: ticket.release(early=True))
+            finally:
+                ticket.release()
+
+        leader = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(request()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        # Followers passed through the second slot one by one and gave it straight back
+        assert limiter.stats()["active"] == 1 and limiter.stats()["queued"] == 0
+        release.set()
+        return await asyncio.gather(leader, *followers), limiter.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == ["result"] * 4
+    assert stats["active"] == 0 and stats["admitted"] == 4
+
+def test_released_slot_is_handed_to_the_next_waiter_in_order():
+    async def run():
+        limiter = ConcurrencyLimiter("match", limit=1, max_queue=5, queue_timeout=1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(i):
+            await limiter.acquire()
+            order.append(i)
+
+        waiters = [asyncio.create_task(wait(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued"] == 3
+        for _ in range(3):
+            limiter.release(0.01)
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        # Each release handed the slot over instead of freeing it
+        return order, limiter.stats()
+
+    order, stats = asyncio.run(run())
+    assert order == [0, 1, 2]
+    assert stats["active"] == 1 and stats["admitted"] == 4
+
+def test_full_queue_and_timeout_are_rejected():
+    async def run():
+        limiter = ConcurrencyLimiter("match", limit=1, max_queue=1, queue_timeout=0.02)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await waiter
+        limiter.release()
+        return full.value, timed_out.value, limiter.stats()
+
+    full, timed_out, stats = asyncio.run(run())
+    assert full.status_code == 503 and timed_out.status_code == 503
+    assert stats["rejected_queue_full"] == 1 and stats["rejected_timeout"] == 1
+    assert stats["active"] == 0 and stats["queued"] == 0
@@ -0,0 +1,21 @@
+from database import TALENT_FILTER_COLUMNS, apply_filters, row_matches
+from models import MatchFilters
+
+class RecordingQuery:
+    """Stands in for a postgrest query builder, recording filter calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.calls.append((name, *args))
+            return self
+        return record
+
+def test_location_wildcards_match_literally():
+    filters = MatchFilters(location=" 100%_remote\\ ")
+    query = apply_filters(RecordingQuery(), filters, TALENT_FILTER_COLUMNS)
+    assert query.calls == [("ilike", "location", "%100\\%\\_remote\\\\%")]
+    assert row_matches({"location": "Office: 100%_Remote\\"}, filters, TALENT_FILTER_COLUMNS)
+    assert not row_matches({"location": "100 percent remote"}, filters, TALENT_FILTER_COLUMNS)
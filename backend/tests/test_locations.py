@@ -0,0 +1,29 @@
+import pytest
+from locations import (
+    DEFAULT_GAZETTEER, DIFFERENT, SAME, SAME_COUNTRY, SAME_REGION, WITHIN, LocationNormalizer
+)
+
+@pytest.fixture(scope="module")
+def locations():
+    return LocationNormalizer.from_file(DEFAULT_GAZETTEER)
+
+@pytest.mark.parametrize("a, b, relation", [
+    # "ca" names both California and Canada: the one containing the city wins
+    ("Toronto, CA", "Toronto", SAME),
+    ("San Jose, CA", "San Jose", SAME),
+    ("Brooklyn, NY, USA", "New York", SAME),
+    ("Ontario, Canada", "Ontario", SAME),
+    # Unknown or mismatched cities are somewhere in their qualifier
+    ("Paris, TX", "Texas", WITHIN),
+    ("Ottawa, ON", "Canada", WITHIN),
+    ("Paris, TX", "Austin, TX", SAME_REGION),
+    ("Toronto, Canada", "Ottawa, ON", SAME_REGION),
+    ("Ottawa, ON", "Kingston, ON", SAME_REGION),
+    ("Ottawa, ON", "Quebec City, Canada", SAME_COUNTRY),
+    ("Ottawa, ON", "Montreal", SAME_COUNTRY),
+    ("Ottawa, ON", "Berlin", DIFFERENT),
+    ("Paris, TX", "Paris, TX", SAME),
+])
+def test_relations(locations, a, b, relation):
+    assert locations.relation(a, b) == relation
+    assert locations.relation(b, a) == relation
@@ -0,0 +1,54 @@
+from match_analytics import MatchAnalytics
+from matching_engine import matching_engine
+
+def test_repeated_requests_count_once(synthetic):
+    talents, jobs = synthetic
+    results = matching_engine.match_talent_to_jobs(talents[0], jobs)
+    analytics = MatchAnalytics()
+    analytics.record("talent", talents[0].id, results, len(jobs), len(jobs))
+    once = analytics.summary()
+    for _ in range(3):
+        analytics.record("talent", talents[0].id, results, len(jobs), len(jobs))
+    again = analytics.summary()
+    assert again["score_histograms"] == once["score_histograms"]
+    assert again["missing_skills"] == once["missing_skills"]
+    assert again["coverage"]["scans"] == 4
+
+def test_recomputing_replaces_the_old_list(synthetic):
+    talents, jobs = synthetic
+    analytics = MatchAnalytics()
+    analytics.record("talent", talents[0].id, matching_engine.match_talent_to_jobs(talents[0], jobs), 8, 8)
+    shorter = matching_engine.match_talent_to_jobs(talents[0], jobs, limit=3)
+    analytics.record("talent", talents[0].id, shorter, 8, 8)
+    expected = MatchAnalytics()
+    expected.record("talent", talents[0].id, shorter, 8, 8)
+    for name in ("score_histograms", "missing_skills"):
+        assert analytics.summary()[name] == expected.summary()[name]
+
+def test_partial_scans_only_count_towards_coverage(synthetic):
+    talents, jobs = synthetic
+    analytics = MatchAnalytics()
+    analytics.record("talent", talents[0].id, matching_engine.match_talent_to_jobs(talents[0], jobs[:2]), 2, 8)
+    summary = analytics.summary()
+    assert summary["score_histograms"]["match"]["count"] == 0
+    assert summary["coverage"]["partial_scans"] == 1
+
+def test_job_average_uses_the_jobs_own_matches(synthetic):
+    talents, jobs = synthetic
+    analytics = MatchAnalytics()
+    for talent in talents[:5]:
+        analytics.record("talent", talent.id, matching_engine.match_talent_to_jobs(talent, jobs), 8, 8)
+    assert analytics.job_average(jobs[0].id) is None
+    results = matching_engine.match_job_to_talents(jobs[0], talents, limit=10)
+    analytics.record("job", jobs[0].id, results, 40, 40)
+    average = sum(result.match_score for result in results) / len(results)
+    assert analytics.job_average(jobs[0].id) == {
+        "job_id": jobs[0].id, "matches": 10, "average_match_score": round(average, 2)
+    }
+
+def test_oldest_lists_are_taken_back(synthetic):
+    talents, jobs = synthetic
+    analytics = MatchAnalytics(max_entities=2)
+    for talent in talents[:3]:
+        analytics.record("talent", talent.id, matching_engine.match_talent_to_jobs(talent, jobs), 8, 8)
+    assert analytics.summary()["score_histograms"]["match"]["count"] == 2 * len(jobs)
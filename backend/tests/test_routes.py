@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+import database as db
+from config import get_settings
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("DATA_BACKEND", "memory")
+    get_settings.cache_clear()
+    monkeypatch.setattr(db, "_repository", None)
+    import main
+    with TestClient(main.app) as client:
+        yield client
+    get_settings.cache_clear()
+
+@pytest.mark.parametrize("path, key", [
+    ("/api/matching/talent/talent-1/similar", "talent_id"),
+    ("/api/matching/job/job-1/similar", "job_id"),
+])
+def test_similar_routes(client, path, key):
+    response = client.get(path, params={"limit": 5})
+    assert response.status_code == 200
+    neighbours = response.json()
+    assert 0 < len(neighbours) <= 5
+    assert all(neighbour[key] and 0 <= neighbour["similarity"] <= 1 for neighbour in neighbours)
+
+@pytest.mark.parametrize("path", ["/api/matching/talent/nope/similar", "/api/matching/job/nope/similar"])
+def test_similar_routes_unknown_entity(client, path):
+    assert client.get(path).status_code == 404
+
+def test_location_filter_rejects_postgrest_wildcard(client):
+    response = client.post("/api/matching/talent/talent-1/jobs", params={"location": "new*york"})
+    assert response.status_code == 422
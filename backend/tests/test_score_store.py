@@ -0,0 +1,49 @@
+import pytest
+from matching_engine import matching_engine
+from score_store import CompactScoreStore
+
+pytestmark = pytest.mark.parametrize("synthetic", [(60, 10)], indirect=True)
+
+def test_round_trip_is_exact(synthetic):
+    talents, jobs = synthetic
+    store = CompactScoreStore()
+    for job in jobs:
+        store.put("job", job.id, matching_engine.match_job_to_talents(job, talents))
+    for talent in talents[:10]:
+        store.put("talent", talent.id, matching_engine.match_talent_to_jobs(talent, jobs))
+    for job in jobs:
+        assert store.get("job", job.id) == matching_engine.match_job_to_talents(job, talents)
+    for talent in talents[:10]:
+        assert store.get("talent", talent.id) == matching_engine.match_talent_to_jobs(talent, jobs)
+
+def test_limit_min_score_and_threshold(synthetic):
+    talents, jobs = synthetic
+    results = matching_engine.match_job_to_talents(jobs[0], talents)
+    cutoff = results[len(results) // 2].match_score
+    store = CompactScoreStore(threshold=cutoff)
+    store.put("job", jobs[0].id, results)
+    kept = [result for result in results if result.match_score >= cutoff]
+    assert store.stored("job", jobs[0].id) == (len(kept), len(results) - len(kept))
+    assert store.get("job", jobs[0].id, limit=3) == kept[:3]
+    top = results[0].match_score
+    assert store.get("job", jobs[0].id, min_score=top) == [r for r in results if r.match_score >= top]
+
+def test_half_point_components_round_down(synthetic):
+    talents, jobs = synthetic
+    results = matching_engine.match_talent_to_jobs(talents[0], jobs)
+    store = CompactScoreStore(component_type="B")
+    store.put("talent", talents[0].id, results)
+    for original, stored in zip(results, store.get("talent", talents[0].id)):
+        assert stored.match_score == original.match_score
+        assert stored.job_id == original.job_id
+        assert 0 <= original.skill_match_score - stored.skill_match_score < 0.5
+
+def test_discard_and_unknown_entities(synthetic):
+    talents, jobs = synthetic
+    store = CompactScoreStore()
+    assert store.get("job", jobs[0].id) is None
+    store.put("job", jobs[0].id, matching_engine.match_job_to_talents(jobs[0], talents, limit=5))
+    store.discard("job", jobs[0].id)
+    assert store.get("job", jobs[0].id) is None and len(store) == 0
+    with pytest.raises(ValueError):
+        store.put("company", "c-1", [])
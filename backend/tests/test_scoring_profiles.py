@@ -0,0 +1,30 @@
+import pytest
+from pydantic import ValidationError
+from matching_engine import matching_engine
+from scoring_profiles import ScoringProfile
+
+def _profile(**experience) -> ScoringProfile:
+    return ScoringProfile(
+        name="test",
+        weights={"skills": 0, "experience": 1, "location": 0, "salary": 0},
+        experience=experience
+    )
+
+@pytest.mark.parametrize("experience", [
+    {"level_one_off": 90, "level_far": 90, "overqualified_floor": 100},
+    {"level_exact": 50, "level_far": 70, "years_points": 40},
+    {"overqualified_floor": 50, "level_exact": 60},
+    {"underqualified_penalty_per_year": -10},
+    {"overqualified_penalty_per_year": -5},
+    {"level_far": 101},
+])
+def test_experience_thresholds_that_could_leave_0_100_are_rejected(experience):
+    with pytest.raises(ValidationError):
+        _profile(**experience)
+
+def test_valid_experience_profile_keeps_scores_in_range(synthetic):
+    profile = _profile(level_exact=50, level_one_off=50, level_far=50, years_points=50, overqualified_floor=50)
+    talents, jobs = synthetic
+    for job in jobs:
+        for result in matching_engine.match_job_to_talents(job, talents, profile=profile.compile()):
+            assert 0 <= result.experience_match_score <= 100
@@ -0,0 +1,71 @@
+import asyncio
+from singleflight import SingleFlight
+
+def test_concurrent_callers_share_one_computation():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["match"]
+
+    async def run():
+        flight = SingleFlight(ttl=0)
+        return await asyncio.gather(*[flight.do(("job", "job-1"), compute) for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+
+def test_results_are_reused_within_the_ttl():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run():
+        flight = SingleFlight(ttl=60)
+        first = await flight.do("key", compute)
+        second = await flight.do("key", compute)
+        flight.clear()
+        return first, second, await flight.do("key", compute)
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+def test_failures_are_shared_but_not_cached():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    async def run():
+        flight = SingleFlight(ttl=60)
+        failed = await asyncio.gather(*[flight.do("key", compute) for _ in range(3)], return_exceptions=True)
+        return failed, await flight.do("key", compute)
+
+    failed, retried = asyncio.run(run())
+    assert all(isinstance(error, RuntimeError) for error in failed)
+    assert retried == "ok" and calls == 2
+
+def test_a_cancelled_caller_does_not_cancel_shared_work():
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        flight = SingleFlight(ttl=0)
+        first = asyncio.create_task(flight.do("key", compute))
+        second = asyncio.create_task(flight.do("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
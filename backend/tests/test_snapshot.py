@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from database import MemoryBackend, SnapshotBackend
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+@pytest.fixture
+def source():
+    backend = MemoryBackend.synthetic(talents=50, jobs=10)
+    for i, row in enumerate([*backend.talents.values(), *backend.jobs.values()]):
+        row["updated_at"] = (BASE + timedelta(seconds=i)).isoformat()
+    return backend
+
+def touch(row: dict, seconds: int):
+    row["updated_at"] = (BASE + timedelta(hours=1, seconds=seconds)).isoformat()
+
+def test_initial_sync_loads_everything(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    stats = snapshot.sync()
+    assert stats["talents"]["rows"] == 50
+    assert stats["jobs"]["rows"] == 10
+    assert snapshot.talents == source.talents
+
+def test_incremental_sync_applies_updates_and_inserts(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    snapshot.sync()
+
+    updated = dict(source.talents["talent-3"], title="Staff Engineer")
+    touch(updated, 1)
+    source.talents["talent-3"] = updated
+    inserted = dict(source.jobs["job-0"], id="job-new")
+    touch(inserted, 2)
+    source.jobs["job-new"] = inserted
+
+    stats = snapshot.sync()
+    assert stats["talents"]["changed"] == 1
+    assert stats["jobs"]["changed"] == 1
+    assert snapshot.talents["talent-3"]["title"] == "Staff Engineer"
+    assert "job-new" in snapshot.jobs
+    assert snapshot.talents == source.talents and snapshot.jobs == source.jobs
+
+def test_deletions_are_detected(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    snapshot.sync()
+    del source.talents["talent-7"]
+    del source.talents["talent-41"]
+
+    stats = snapshot.sync()
+    assert stats["talents"]["deleted"] == 2
+    assert set(snapshot.talents) == set(source.talents)
+
+def test_full_sync_keeps_unchanged_rows(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    snapshot.sync()
+    snapshot.sync()
+
+    stats = snapshot.sync(full=True)
+    assert stats["talents"]["rows"] == 50
+    assert stats["jobs"]["rows"] == 10
+    assert snapshot.talents == source.talents and snapshot.jobs == source.jobs
+
+def test_full_sync_drops_deleted_rows(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    snapshot.sync()
+    del source.jobs["job-4"]
+
+    snapshot.sync(full=True)
+    assert set(snapshot.jobs) == set(source.jobs)
+
+def test_parsed_models_follow_syncs(source):
+    snapshot = SnapshotBackend(source, overlap_seconds=0)
+    snapshot.sync()
+    assert {talent.id for talent in snapshot.fetch_models("talents")} == set(source.talents)
+
+    updated = dict(source.talents["talent-3"], title="Staff Engineer")
+    touch(updated, 1)
+    source.talents["talent-3"] = updated
+    del source.talents["talent-9"]
+    snapshot.sync()
+
+    talents = {talent.id: talent for talent in snapshot.fetch_models("talents")}
+    assert talents["talent-3"].title == "Staff Engineer"
+    assert "talent-9" not in talents and "talent-9" not in snapshot.models["talents"]
+    # Unchanged rows keep their parsed objects
+    assert talents["talent-4"] is snapshot.models["talents"]["talent-4"]
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Budget documented in the README ("Startup time"); most of it is FastAPI itself
+IMPORT_BUDGET_MS = 300
+RUNS = 5
+
+def _import_ms() -> float:
+    """Cumulative `import main` time in ms, from -X importtime, with no environment"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env={}, capture_output=True, text=True, check=True
+    ).stderr
+    for line in output.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        _, cumulative, name = line.rsplit("|", 2)
+        if name.strip() == "main":
+            return int(cumulative) / 1000
+    raise AssertionError(f"no timing for main in:\n{output}")
+
+def test_import_main_within_budget():
+    # Best of several runs, so a busy machine doesn't fail the budget
+    timings = [_import_ms() for _ in range(RUNS)]
+    best = min(timings)
+    print(f"import main: best {best:.0f} ms of {', '.join(f'{t:.0f}' for t in timings)} (budget {IMPORT_BUDGET_MS} ms)")
+    assert best <= IMPORT_BUDGET_MS, f"import main took {best:.0f} ms, over the {IMPORT_BUDGET_MS} ms budget"
@@ -0,0 +1,40 @@
+import asyncio
+from matching_engine import matching_engine
+from work_queue import MatchWorkQueue, PrecomputedMatches
+
+def test_creating_a_counterpart_invalidates_stored_lists(synthetic):
+    talents, jobs = synthetic
+    store = PrecomputedMatches(top_n=10)
+    store.put("job", jobs[0].id, matching_engine.match_job_to_talents(jobs[0], talents, limit=10))
+    store.put("talent", talents[0].id, matching_engine.match_talent_to_jobs(talents[0], jobs, limit=5))
+    assert store.get("job", jobs[0].id, 10) is not None
+    store.invalidate("job")
+    assert store.get("job", jobs[0].id, 10) is None
+    assert store.get("talent", talents[0].id, 5) is not None
+
+def test_lists_computed_before_an_invalidation_are_not_stored(synthetic):
+    talents, jobs = synthetic
+    store = PrecomputedMatches(top_n=10)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def compute(kind, entity_id, limit):
+        started.set()
+        await release.wait()
+        return matching_engine.match_job_to_talents(jobs[0], talents, limit=limit)
+
+    async def run():
+        queue = MatchWorkQueue(compute, store, workers=1)
+        queue.start()
+        job = queue.submit("job", jobs[0].id)
+        await started.wait()
+        # A talent is created while the job's list is being computed
+        store.invalidate("job")
+        release.set()
+        await queue.join()
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.state.value == "done"
+    assert store.get("job", jobs[0].id, 10) is None
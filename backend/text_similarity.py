@@ -0,0 +1,185 @@
+import json
+import math
+import re
+import sys
+import zlib
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config import get_settings
+from models import TalentProfile, JobPosting
+
+# Hashed unigram + bigram features: no vocabulary to build or ship
+FEATURE_BITS = 20
+_FEATURE_MASK = (1 << FEATURE_BITS) - 1
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+SparseVector = Dict[int, float]
+
+def talent_text(talent: TalentProfile) -> str:
+    return f"{talent.title} {talent.bio or ''}"
+
+def job_text(job: JobPosting) -> str:
+    return f"{job.title} {job.description or ''}"
+
+def features(text: str) -> Counter:
+    """Hashed unigram and bigram counts of a text"""
+    tokens = _TOKEN.findall((text or "").lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return Counter(zlib.crc32(gram.encode("utf-8")) & _FEATURE_MASK for gram in grams)
+
+class TfidfIndex:
+    """
+    Sparse TF-IDF vectors of talent titles/bios and job titles/descriptions
+    IDF weights are fitted offline (see `python text_similarity.py build`).
+    Each side is stored as an inverted index (feature -> entity positions and
+    weights), so scoring one query against a whole batch is a single sparse
+    matrix-vector product that only touches entities sharing a feature.
+    """
+
+    def __init__(self, idf: Optional[Dict[int, float]] = None, n_docs: int = 0):
+        self.idf = idf or {}
+        self.n_docs = n_docs
+        # Weight for features never seen when fitting
+        self.default_idf = math.log(1 + n_docs) + 1
+        self._ids: Dict[str, List[str]] = {"talents": [], "jobs": []}
+        self._positions: Dict[str, Dict[str, int]] = {"talents": {}, "jobs": {}}
+        self._postings: Dict[str, Dict[int, Tuple[array, array]]] = {"talents": {}, "jobs": {}}
+
+    @classmethod
+    def fit(cls, talents: List[TalentProfile], jobs: List[JobPosting]) -> "TfidfIndex":
+        """Fit IDF weights on every talent and job text, and index them"""
+        talent_features = [features(talent_text(t)) for t in talents]
+        job_features = [features(job_text(j)) for j in jobs]
+        df = Counter()
+        for counts in talent_features + job_features:
+            df.update(counts.keys())
+        n_docs = len(talent_features) + len(job_features)
+        idf = {f: math.log((1 + n_docs) / (1 + count)) + 1 for f, count in df.items()}
+
+        index = cls(idf, n_docs)
+        for talent, counts in zip(talents, talent_features):
+            index._add("talents", talent.id, index._weigh(counts))
+        for job, counts in zip(jobs, job_features):
+            index._add("jobs", job.id, index._weigh(counts))
+        return index
+
+    def _weigh(self, counts: Counter) -> SparseVector:
+        """Sublinear TF x IDF, L2-normalized"""
+        idf, default_idf = self.idf, self.default_idf
+        vector = {f: (1 + math.log(tf)) * idf.get(f, default_idf) for f, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm:
+            vector = {f: w / norm for f, w in vector.items()}
+        return vector
+
+    def count(self, kind: str) -> int:
+        return len(self._ids[kind])
+
+    def vectorize(self, text: str) -> SparseVector:
+        return self._weigh(features(text))
+
+    def _add(self, kind: str, entity_id: str, vector: SparseVector):
+        if entity_id in self._positions[kind]:
+            # Re-indexing is rare (offline rebuilds); new vectors are scored on the fly
+            return
+        position = len(self._ids[kind])
+        self._ids[kind].append(entity_id)
+        self._positions[kind][entity_id] = position
+        postings = self._postings[kind]
+        for f, w in vector.items():
+            entry = postings.get(f)
+            if entry is None:
+                entry = postings[f] = (array("I"), array("d"))
+            entry[0].append(position)
+            entry[1].append(w)
+
+    def similarities(self, query: SparseVector, kind: str, ids: List[str], texts: Iterable[str]) -> List[float]:
+        """Cosine similarity (0-1) of `query` with each entity in `ids`"""
+        similarity = self.scorer(query, kind)
+        return [similarity(entity_id, text) for entity_id, text in zip(ids, texts)]
+
+    def scorer(self, query: SparseVector, kind: str) -> Callable[[str, str], float]:
+        """
+        Cosine similarity (0-1) of `query` with one entity at a time, given its id and text
+        Indexed entities come from one sparse product over the postings;
+        entities missing from the index are vectorized from their text.
+        """
+        scores = array("d", bytes(8 * len(self._ids[kind])))
+        postings = self._postings[kind]
+        for f, qw in query.items():
+            entry = postings.get(f)
+            if entry is None:
+                continue
+            for position, w in zip(*entry):
+                scores[position] += qw * w
+
+        positions = self._positions[kind]
+
+        def similarity(entity_id: str, text: str) -> float:
+            position = positions.get(entity_id)
+            if position is not None:
+                return scores[position]
+            vector = self.vectorize(text)
+            return sum(qw * vector.get(f, 0.0) for f, qw in query.items())
+        return similarity
+
+    def save(self, path: str):
+        def dump(kind):
+            vectors = {entity_id: {} for entity_id in self._ids[kind]}
+            for f, (positions, weights) in self._postings[kind].items():
+                for position, w in zip(positions, weights):
+                    vectors[self._ids[kind][position]][f] = round(w, 6)
+            return {entity_id: list(vector.items()) for entity_id, vector in vectors.items()}
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "n_docs": self.n_docs,
+                "idf": list(self.idf.items()),
+                "talents": dump("talents"),
+                "jobs": dump("jobs")
+            }, f)
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfIndex":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls({int(f): w for f, w in data["idf"]}, data["n_docs"])
+        for kind in ("talents", "jobs"):
+            for entity_id, vector in data[kind].items():
+                index._add(kind, entity_id, {int(f): w for f, w in vector})
+        return index
+
+_text_index: Optional[TfidfIndex] = None
+
+def get_text_index() -> TfidfIndex:
+    """
+    Index from the TEXT_INDEX_FILE setting, loaded on first use
+    Without one, texts are compared with plain hashed TF (all IDF weights equal).
+    """
+    global _text_index
+    if _text_index is None:
+        path = get_settings().text_index_file
+        try:
+            _text_index = TfidfIndex.load(path) if path else TfidfIndex()
+        except FileNotFoundError:
+            print(f"Text index '{path}' not found; run 'python text_similarity.py build {path}'")
+            _text_index = TfidfIndex()
+    return _text_index
+
+if __name__ == "__main__":
+    # Offline build: python text_similarity.py build [output.json]
+    import asyncio
+    import database as db
+
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("Usage: python text_similarity.py build [output.json]")
+        sys.exit(1)
+    output = sys.argv[2] if len(sys.argv) > 2 else (get_settings().text_index_file or "text_index.json")
+
+    async def build():
+        return TfidfIndex.fit(await db.get_all_talents(), await db.get_all_jobs())
+
+    index = asyncio.run(build())
+    index.save(output)
+    print(f"Indexed {index.count('talents')} talents and {index.count('jobs')} jobs into {output}")
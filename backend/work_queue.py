@@ -0,0 +1,230 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from models import MatchResult, MatchJobState, MatchJobStatus
+from score_store import CompactScoreStore
+
+# compute(kind, entity_id, limit) -> top matches for the entity
+ComputeFn = Callable[[str, str, int], Awaitable[List[MatchResult]]]
+
+class QueueFullError(Exception):
+    """The work queue is at capacity; the caller should shed or retry later"""
+
+class PrecomputedMatches:
+    """
+    Top-N matches per talent/job (default profile, no filters), written by the
+    work queue so the first read after creation is served without a scan.
+    Creating a talent invalidates every stored job list (and vice versa),
+    since the newcomer may belong in them; entries also expire after `ttl`
+    seconds, which bounds how long they can miss rows changed outside the
+    API. Results are held quantized in a CompactScoreStore; pairs scoring
+    below `min_score` are not kept.
+    """
+
+    def __init__(self, top_n: int = 100, ttl: float = 60, max_entries: int = 10_000, min_score: float = 0.0):
+        self.top_n = top_n
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.scores = CompactScoreStore(threshold=min_score)
+        self._expires: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        # Bumped by invalidate(), so lists computed before it are not stored after it
+        self._epochs: Dict[str, int] = {"talent": 0, "job": 0}
+
+    def get(self, kind: str, entity_id: str, limit: int) -> Optional[List[MatchResult]]:
+        """Top `limit` stored matches, or None if missing, expired or too short"""
+        key = (kind, entity_id)
+        expires_at = self._expires.get(key)
+        if expires_at is None:
+            return None
+        if expires_at <= time.monotonic():
+            self.discard(kind, entity_id)
+            return None
+        if limit > self.top_n:
+            return None
+        stored, dropped = self.scores.stored(kind, entity_id)
+        if stored < limit and dropped:
+            # The rest of the top `limit` scored below min_score and was not kept
+            return None
+        return self.scores.get(kind, entity_id, limit)
+
+    def epoch(self, kind: str) -> int:
+        """Current epoch of a kind; pass it to put() with results computed from now on"""
+        return self._epochs[kind]
+
+    def put(self, kind: str, entity_id: str, results: List[MatchResult], epoch: Optional[int] = None):
+        if epoch is not None and epoch != self._epochs[kind]:
+            # Computed before an invalidation: it may miss a newer counterpart
+            return
+        key = (kind, entity_id)
+        self._expires.pop(key, None)
+        if len(self._expires) >= self.max_entries:
+            oldest, _ = self._expires.popitem(last=False)
+            self.scores.discard(*oldest)
+        self.scores.put(kind, entity_id, results[:self.top_n])
+        self._expires[key] = time.monotonic() + self.ttl
+
+    def discard(self, kind: str, entity_id: str):
+        self._expires.pop((kind, entity_id), None)
+        self.scores.discard(kind, entity_id)
+
+    def invalidate(self, kind: str):
+        """Drop every stored list of a kind, e.g. job lists once a talent is created"""
+        self._epochs[kind] += 1
+        for key in [key for key in self._expires if key[0] == kind]:
+            self.discard(*key)
+
+    def clear(self):
+        self._expires.clear()
+        self.scores.clear()
+
+    def stats(self) -> dict:
+        return {"top_n": self.top_n, "ttl": self.ttl, "max_entries": self.max_entries, **self.scores.stats()}
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+class MatchWorkQueue:
+    """
+    In-process queue of match computations for newly created talents and jobs
+    A fixed pool of workers bounds how many scans run at once. Submissions
+    beyond `max_pending` raise QueueFullError instead of growing memory, and
+    a submission for an entity that is still queued reuses the queued job.
+    Failed computations are retried with exponential backoff; the outcome of
+    the last `history` jobs is kept for status queries.
+    """
+
+    def __init__(
+        self,
+        compute: ComputeFn,
+        store: PrecomputedMatches,
+        workers: int = 2,
+        max_pending: int = 256,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.5,
+        history: int = 1000
+    ):
+        self.compute = compute
+        self.store = store
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.history = history
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._jobs: "OrderedDict[str, MatchJobStatus]" = OrderedDict()
+        self._queued: Dict[Tuple[str, str], str] = {}
+        self._ids = itertools.count(1)
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """Start the worker pool (idempotent); call from a running event loop"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; unfinished jobs are marked failed and dropped"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            if job.state in (MatchJobState.queued, MatchJobState.running):
+                job.state = MatchJobState.failed
+                job.error = "Match queue stopped"
+                job.finished_at = _now()
+        # A fresh queue, so a restart (possibly on another event loop) starts clean
+        self._queue = asyncio.Queue(maxsize=self._queue.maxsize)
+        self._queued.clear()
+
+    def submit(self, kind: str, entity_id: str) -> MatchJobStatus:
+        """Queue a match computation for a talent ("talent") or job ("job")"""
+        if kind not in ("talent", "job"):
+            raise ValueError(f"Unknown match job kind '{kind}'")
+        queued = self._queued.get((kind, entity_id))
+        if queued is not None:
+            return self._jobs[queued]
+
+        job = MatchJobStatus(
+            id=f"mj-{next(self._ids)}",
+            kind=kind,
+            entity_id=entity_id,
+            submitted_at=_now()
+        )
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Match queue is full ({self._queue.maxsize} pending)")
+        self._remember(job)
+        self._queued[(kind, entity_id)] = job.id
+        return job
+
+    def status(self, job_id: str) -> Optional[MatchJobStatus]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        states = {state.value: 0 for state in MatchJobState}
+        for job in self._jobs.values():
+            states[job.state.value] += 1
+        return {
+            "workers": len(self._tasks),
+            "pending": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "jobs": states
+        }
+
+    def _remember(self, job: MatchJobStatus):
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.history:
+            oldest = next(iter(self._jobs.values()))
+            if oldest.state in (MatchJobState.queued, MatchJobState.running):
+                # Never forget unfinished jobs; the queue bound caps these anyway
+                break
+            self._jobs.popitem(last=False)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs[job_id]
+                self._queued.pop((job.kind, job.entity_id), None)
+                await self._run(job)
+            except Exception as e:
+                print(f"Match worker error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: MatchJobStatus):
+        job.state = MatchJobState.running
+        while True:
+            job.attempts += 1
+            epoch = self.store.epoch(job.kind)
+            try:
+                results = await self.compute(job.kind, job.entity_id, self.store.top_n)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.error = getattr(e, "detail", None) or str(e)
+                if job.attempts >= self.max_attempts:
+                    job.state = MatchJobState.failed
+                    job.finished_at = _now()
+                    print(f"Match job {job.id} ({job.kind} {job.entity_id}) failed: {job.error}")
+                    return
+                # Newly inserted rows can take a moment to become readable
+                await asyncio.sleep(self.retry_backoff * 2 ** (job.attempts - 1))
+                continue
+            self.store.put(job.kind, job.entity_id, results, epoch)
+            job.state = MatchJobState.done
+            job.error = None
+            job.result_count = len(results)
+            job.finished_at = _now()
+            return
+
+    async def join(self):
+        """Wait until every queued job has been processed"""
+        await self._queue.join()